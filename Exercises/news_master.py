@@ -1,49 +1,26 @@
 import streamlit as st
+from concurrent.futures import ThreadPoolExecutor
 from config import load_google_llm, newsContext
-from langchain_core.prompts import PromptTemplate
-from langchain_core.output_parsers import PydanticOutputParser
-from pydantic import BaseModel
-from firebase_admin import credentials, firestore
-import firebase_admin
-import os
-import datetime
-import json
-from typing import List, Optional
+from news_pipeline import (
+    extract_articles,
+    analyze_news,
+    calculate_credibility_score,
+    parse_country_list,
+    analyze_countries,
+    analyze_article,
+    stream_article,
+    save_analyses,
+)
+from news_store import (
+    load_stats,
+    query_history,
+    load_news_details,
+    SENTIMENTS,
+    HISTORY_SORTS,
+)
 
-# ------------------------------- 
-# Firebase Setup
-# ------------------------------- 
-script_dir = os.path.dirname(__file__)
-key_path = os.path.join(script_dir, "serviceAccountKey.json")
-
-if not firebase_admin._apps:  # Prevent reinitialization
-    cred = credentials.Certificate(key_path)
-    firebase_admin.initialize_app(cred)
-
-db = firestore.client()
 llm = load_google_llm()
 
-# ------------------------------- 
-# Pydantic Models
-# ------------------------------- 
-class News(BaseModel):
-    title: str
-    article: str
-    ai_summary: str
-    sentiment_analysis: str
-    key_topics: str
-    credibility_assessment: str  # Fixed spelling
-    pidgin_version: str
-    timestamp: Optional[str] = None
-    country: Optional[str] = None
-    confidence_score: Optional[float] = None
-    
-    class Config:
-        # For Pydantic v1 compatibility
-        allow_population_by_field_name = True
-
-parser = PydanticOutputParser(pydantic_object=News)
-
 # ------------------------------- 
 # Custom CSS Styling
 # ------------------------------- 
@@ -205,7 +182,8 @@ def load_css():
 # Helper Functions
 # ------------------------------- 
 def get_sentiment_color(sentiment):
-    sentiment_lower = sentiment.lower()
+    # Accepts the Sentiment enum or the free-text analysis
+    sentiment_lower = getattr(sentiment, 'value', sentiment).lower()
     if 'positive' in sentiment_lower:
         return 'sentiment-positive'
     elif 'negative' in sentiment_lower:
@@ -213,16 +191,6 @@ def get_sentiment_color(sentiment):
     else:
         return 'sentiment-neutral'
 
-def calculate_credibility_score(assessment):
-    """Calculate a numerical credibility score from text assessment"""
-    assessment_lower = assessment.lower()
-    if any(word in assessment_lower for word in ['high', 'reliable', 'credible', 'trustworthy']):
-        return 0.8 + (hash(assessment) % 20) / 100  # 0.8-0.99
-    elif any(word in assessment_lower for word in ['medium', 'moderate', 'fair']):
-        return 0.5 + (hash(assessment) % 30) / 100  # 0.5-0.79
-    else:
-        return 0.2 + (hash(assessment) % 30) / 100  # 0.2-0.49
-
 def display_news_analysis(parsed_result, country):
     """Display the news analysis in a professional format"""
     
@@ -258,8 +226,11 @@ def display_news_analysis(parsed_result, country):
     
     with col2:
         # Metrics sidebar
-        sentiment_class = get_sentiment_color(parsed_result.sentiment_analysis)
-        credibility_score = calculate_credibility_score(parsed_result.credibility_assessment)
+        sentiment_class = get_sentiment_color(parsed_result.sentiment or parsed_result.sentiment_analysis)
+        credibility_score = parsed_result.confidence_score
+        if credibility_score is None:
+            credibility_score = calculate_credibility_score(parsed_result.credibility_assessment,
+                                                            parsed_result.credibility_score)
         
         st.markdown(f"""
         <div class="metric-card">
@@ -283,7 +254,7 @@ def display_news_analysis(parsed_result, country):
         <div class="metric-card">
             <p class="metric-value">🔑</p>
             <p class="metric-label">Key Topics</p>
-            <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem; color: #495057;">{parsed_result.key_topics}</p>
+            <p style="margin: 0.5rem 0 0 0; font-size: 0.9rem; color: #495057;">{", ".join(parsed_result.topics) or parsed_result.key_topics}</p>
         </div>
         """, unsafe_allow_html=True)
         
@@ -295,33 +266,25 @@ def display_news_analysis(parsed_result, country):
         </div>
         """, unsafe_allow_html=True)
 
-def load_analytics_data():
-    """Load analytics data from Firestore"""
-    try:
-        docs = db.collection("news_articles").stream()
-        data = []
-        for doc in docs:
-            doc_data = doc.to_dict()
-            data.append(doc_data)
-        return data
-    except Exception as e:
-        st.error(f"Error loading analytics data: {e}")
-        return []
-
 def display_analytics():
     """Display analytics dashboard"""
     st.markdown('<div class="main-header"><h1>📊 Analytics Dashboard</h1><p>Insights from your news analysis</p></div>', unsafe_allow_html=True)
     
-    data = load_analytics_data()
+    # One small summary document, kept up to date on every write
+    try:
+        stats = load_stats()
+    except Exception as e:
+        st.error(f"Error loading analytics data: {e}")
+        return
     
-    if not data:
+    if not stats["total"]:
         st.info("No analytics data available yet. Analyze some news first!")
         return
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        total_articles = len(data)
+        total_articles = stats["total"]
         st.markdown(f"""
         <div class="metric-card">
             <p class="metric-value">{total_articles}</p>
@@ -330,8 +293,8 @@ def display_analytics():
         """, unsafe_allow_html=True)
     
     with col2:
-        confidence_scores = [item.get('confidence_score', 0) for item in data if item.get('confidence_score')]
-        avg_credibility = sum(confidence_scores) / len(confidence_scores) if confidence_scores else 0
+        confidence_count = stats["confidence_count"]
+        avg_credibility = stats["confidence_sum"] / confidence_count if confidence_count else 0
         st.markdown(f"""
         <div class="metric-card">
             <p class="metric-value">{avg_credibility:.2f}</p>
@@ -340,8 +303,7 @@ def display_analytics():
         """, unsafe_allow_html=True)
     
     with col3:
-        countries = set(item.get('country') for item in data if item.get('country'))
-        countries_analyzed = len(countries)
+        countries_analyzed = len([country for country in stats["country_counts"] if country != 'Unknown'])
         st.markdown(f"""
         <div class="metric-card">
             <p class="metric-value">{countries_analyzed}</p>
@@ -350,8 +312,7 @@ def display_analytics():
         """, unsafe_allow_html=True)
     
     with col4:
-        timestamps = [item.get('timestamp') for item in data if item.get('timestamp')]
-        latest_analysis = max(timestamps) if timestamps else "N/A"
+        latest_analysis = stats["latest_timestamp"] or "N/A"
         if latest_analysis != "N/A":
             latest_analysis = latest_analysis.split('T')[0]  # Just show date
         st.markdown(f"""
@@ -366,20 +327,10 @@ def display_analytics():
     
     with col1:
         st.subheader("📊 Sentiment Distribution")
-        sentiments = {}
-        for item in data:
-            sentiment = item.get('sentiment_analysis', 'Unknown')
-            # Extract main sentiment word
-            if 'positive' in sentiment.lower():
-                key = 'Positive'
-            elif 'negative' in sentiment.lower():
-                key = 'Negative'
-            else:
-                key = 'Neutral'
-            sentiments[key] = sentiments.get(key, 0) + 1
+        sentiments = stats["sentiment_counts"]
         
         for sentiment, count in sentiments.items():
-            percentage = (count / len(data)) * 100
+            percentage = (count / total_articles) * 100
             color = "#27ae60" if sentiment == "Positive" else "#e74c3c" if sentiment == "Negative" else "#f39c12"
             st.markdown(f"""
             <div style="margin: 0.5rem 0;">
@@ -395,10 +346,7 @@ def display_analytics():
     
     with col2:
         st.subheader("🌍 Top Countries")
-        countries_count = {}
-        for item in data:
-            country = item.get('country', 'Unknown')
-            countries_count[country] = countries_count.get(country, 0) + 1
+        countries_count = stats["country_counts"]
         
         # Sort and show top 5
         sorted_countries = sorted(countries_count.items(), key=lambda x: x[1], reverse=True)[:5]
@@ -418,6 +366,210 @@ def display_analytics():
             </div>
             """, unsafe_allow_html=True)
 
+def display_article_results(result, show_raw_response=False):
+    """Display the per-article analyses of one country"""
+    for index, news in enumerate(result.news):
+        cache_badge = " ⚡ (from cache)" if news.from_cache else ""
+        with st.expander(f"📰 {news.title}{cache_badge}", expanded=index == 0):
+            if news.from_cache:
+                st.caption("⚡ Served from the analysis cache, no AI call was made")
+            display_news_analysis(news, result.country)
+            if news.link:
+                st.markdown(f"[🔗 Read the original article]({news.link})")
+            if show_raw_response and index < len(result.raw_responses) and result.raw_responses[index]:
+                st.code(result.raw_responses[index], language="json")
+    for error in result.errors:
+        st.markdown(f'<div class="alert-error">⚠️ {error}</div>', unsafe_allow_html=True)
+
+# Shown while an analysis streams in, in the order the model writes them
+STREAM_FIELD_LABELS = {
+    "ai_summary": "🤖 AI Summary",
+    "sentiment_analysis": "😊 Sentiment",
+    "key_topics": "🏷️ Key Topics",
+    "credibility_assessment": "🔍 Credibility",
+    "credibility_score": "📈 Credibility Score",
+    "pidgin_version": "🌍 Pidgin Version",
+}
+
+def render_partial_analysis(fields, completed):
+    """Markdown for the fields generated so far, with a cursor on the one still being written"""
+    lines = []
+    for name, label in STREAM_FIELD_LABELS.items():
+        if name in fields:
+            cursor = "" if name in completed else " ▌"
+            lines.append(f"**{label}:** {fields[name]}{cursor}")
+    return "\n\n".join(lines) or "⏳ Waiting for the first tokens..."
+
+def display_finished_analysis(news, country, response=None, show_raw_response=False):
+    if news.from_cache:
+        st.caption("⚡ Served from the analysis cache, no AI call was made")
+    display_news_analysis(news, country.title())
+    if news.link:
+        st.markdown(f"[🔗 Read the original article]({news.link})")
+    if show_raw_response and response:
+        st.code(response, language="json")
+
+def display_streaming_analysis(articles, country, show_raw_response=False, use_cache=True, max_workers=4):
+    """Render the first article field by field as the model writes it, while the other
+    articles are analyzed concurrently on the worker pool and shown in order when done"""
+    news_list = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Submitted before streaming starts, so they run while the first analysis is written
+        futures = [executor.submit(analyze_article, article, country, llm, use_cache, use_cache)
+                   for article in articles[1:]]
+
+        # The title comes from the API, so it is visible before any token is generated
+        with st.expander(f"📰 {articles[0]['title'] or 'Untitled'}", expanded=True):
+            preview = st.empty()
+            try:
+                for event, *payload in stream_article(articles[0], country, llm=llm, use_cache=use_cache,
+                                                      use_firestore_cache=use_cache):
+                    if event == "partial":
+                        preview.markdown(render_partial_analysis(*payload))
+                        continue
+                    news, response = payload
+                    preview.empty()
+                    display_finished_analysis(news, country, response, show_raw_response)
+                    news_list.append(news)
+            except Exception as e:
+                st.markdown(f'<div class="alert-error">⚠️ Analysis failed: {str(e)}</div>', unsafe_allow_html=True)
+
+        for article, future in zip(articles[1:], futures):
+            with st.expander(f"📰 {article['title'] or 'Untitled'}", expanded=False):
+                try:
+                    news, response = future.result()
+                    display_finished_analysis(news, country, response, show_raw_response)
+                    news_list.append(news)
+                except Exception as e:
+                    st.markdown(f'<div class="alert-error">⚠️ Analysis failed: {str(e)}</div>', unsafe_allow_html=True)
+    return news_list
+
+def display_batch_analysis(countries, save_to_db, show_raw_response, max_workers, use_cache=True):
+    """Analyze several countries at once with per-country progress"""
+    if not countries:
+        st.warning("⚠️ Please enter at least one country.")
+        return
+    
+    progress_bar = st.progress(0)
+    status_text = st.empty()
+    status_text.text(f"🔎 Fetching news for {len(countries)} countries...")
+    
+    def on_progress(result, done, total):
+        progress_bar.progress(int(done / total * 100))
+        icon = "✅" if result.ok else "⚠️"
+        status_text.text(f"{icon} {result.country} done ({done}/{total})")
+    
+    try:
+        results = analyze_countries(countries, max_workers=max_workers, save=save_to_db,
+                                    use_cache=use_cache, use_firestore_cache=use_cache, on_progress=on_progress)
+    except Exception as e:
+        progress_bar.empty()
+        status_text.empty()
+        st.markdown(f'<div class="alert-error">⚠️ Batch analysis failed: {str(e)}</div>', unsafe_allow_html=True)
+        return
+    
+    progress_bar.empty()
+    failed = [result for result in results if not result.ok]
+    status_text.text(f"📊 {len(results) - len(failed)} analyzed, {len(failed)} failed")
+    
+    for result in results:
+        st.subheader(f"{'🌍' if result.ok else '⚠️'} {result.country}")
+        if result.ok:
+            display_article_results(result, show_raw_response)
+        else:
+            st.markdown(f'<div class="alert-error">{result.error}</div>', unsafe_allow_html=True)
+
+def display_history():
+    """Paginated History page, filtered and sorted by Firestore"""
+    try:
+        # Country options come from the stats document (one read)
+        countries = sorted(country for country in load_stats()["country_counts"] if country != 'Unknown')
+    except Exception as e:
+        st.error(f"Error loading history: {e}")
+        return
+    
+    if not countries:
+        st.info("No history available yet. Start analyzing some news!")
+        return
+    
+    # Filters
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        country_filter = st.selectbox("Filter by Country:", ["All"] + countries)
+    with col2:
+        sentiment_filter = st.selectbox("Filter by Sentiment:", ["All"] + SENTIMENTS)
+    with col3:
+        sort_by = st.selectbox("Sort by:", list(HISTORY_SORTS))
+    with col4:
+        page_size = st.selectbox("Per page:", [10, 20, 50], index=1)
+    
+    # Cursor stack: start document of every page we went through, reset when filters change
+    filters = (country_filter, sentiment_filter, sort_by, page_size)
+    if st.session_state.get("history_filters") != filters:
+        st.session_state.history_filters = filters
+        st.session_state.history_cursors = [None]
+    cursors = st.session_state.history_cursors
+    
+    try:
+        rows, next_cursor = query_history(
+            country=None if country_filter == "All" else country_filter,
+            sentiment=None if sentiment_filter == "All" else sentiment_filter,
+            sort_by=sort_by,
+            page_size=page_size,
+            start_after_id=cursors[-1],
+        )
+    except Exception as e:
+        st.error(f"Error loading history: {e}")
+        return
+    
+    if not rows:
+        st.info("No analyses match these filters.")
+    
+    details = st.session_state.setdefault("history_details", {})
+    
+    # Display results
+    for doc_id, item in rows:
+        title = item.get('title', 'Untitled')
+        country = item.get('country', 'Unknown')
+        timestamp = item.get('timestamp', 'Unknown')
+        if timestamp != 'Unknown':
+            timestamp = timestamp.split('T')[0]  # Show only date
+        
+        with st.expander(f"📰 {title} - {country} ({timestamp})", expanded=doc_id in details):
+            col1, col2 = st.columns([2, 1])
+            with col1:
+                st.write(f"**Summary:** {item.get('ai_summary', 'N/A')}")
+            with col2:
+                st.write(f"**Sentiment:** {item.get('sentiment', 'N/A')}")
+                st.write(f"**Topics:** {', '.join(item.get('topics') or []) or 'N/A'}")
+                if item.get('confidence_score') is not None:
+                    st.write(f"**Credibility Score:** {item['confidence_score']:.2f}")
+            
+            # The full analysis is only read from Firestore when asked for
+            if doc_id not in details:
+                if st.button("📖 Load full analysis", key=f"details_{doc_id}"):
+                    details[doc_id] = load_news_details(doc_id) or {}
+                    st.rerun()
+            else:
+                full = details[doc_id]
+                st.write(f"**Article:** {full.get('article', 'N/A')}")
+                st.write(f"**Pidgin:** {full.get('pidgin_version', 'N/A')}")
+                st.write(f"**Sentiment analysis:** {full.get('sentiment_analysis', 'N/A')}")
+                st.write(f"**Credibility:** {full.get('credibility_assessment', 'N/A')}")
+    
+    # Pagination
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if len(cursors) > 1 and st.button("⬅️ Previous"):
+            cursors.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(cursors)}")
+    with col3:
+        if next_cursor and st.button("Next ➡️"):
+            cursors.append(next_cursor)
+            st.rerun()
+
 # ------------------------------- 
 # Main Application
 # ------------------------------- 
@@ -441,7 +593,11 @@ def main():
         
         # Sidebar controls
         st.sidebar.markdown("### ⚙️ Analysis Settings")
-        query = st.sidebar.text_input("🌍 Enter a country:", placeholder="e.g., Nigeria, Ghana, Kenya")
+        mode = st.sidebar.radio("Mode:", ["Single country", "Batch"], horizontal=True)
+        if mode == "Single country":
+            query = st.sidebar.text_input("🌍 Enter a country:", placeholder="e.g., Nigeria, Ghana, Kenya")
+        else:
+            countries_text = st.sidebar.text_area("🌍 Enter countries:", placeholder="Nigeria, Ghana, Kenya\n(comma or one per line)")
         
         # Database status
         st.sidebar.markdown("**Database Status:** 🟢 Ready")
@@ -451,6 +607,14 @@ def main():
             save_to_db = st.checkbox("💾 Save to database", value=True)
             show_raw_response = st.checkbox("🔍 Show raw AI response", value=False)
             analysis_depth = st.select_slider("📊 Analysis Depth", options=["Basic", "Standard", "Detailed"], value="Standard")
+            max_workers = st.slider("⚡ Parallel analyses", min_value=1, max_value=16, value=4)
+            use_cache = st.checkbox("♻️ Reuse cached analyses", value=True)
+            stream_results = st.checkbox("✍️ Stream the first result as it is generated", value=True)
+        
+        if mode == "Batch":
+            if st.sidebar.button("🚀 Analyze All", type="primary"):
+                display_batch_analysis(parse_country_list(countries_text), save_to_db, show_raw_response, max_workers, use_cache)
+            return
         
         # Analysis button
         if st.sidebar.button("🚀 Analyze News", type="primary"):
@@ -471,110 +635,59 @@ def main():
                     
                     my_tool = newsContext(query)
                     
-                    # Step 2: Prepare prompt
+                    # Step 2: Pick the articles
                     status_text.text("🤖 Preparing AI analysis...")
                     progress_bar.progress(50)
                     
-                    prompt_template = PromptTemplate.from_template(
-                        """
-                        You are an expert news analyst. Analyze the following news articles: {context}
+                    articles = extract_articles(my_tool)
+                    
+                    if stream_results:
+                        # Step 3: Analyze and render token by token
+                        progress_bar.empty()
+                        status_text.empty()
+                        if not articles:
+                            raise ValueError("No articles found")
+                        news_list = display_streaming_analysis(articles, query, show_raw_response, use_cache, max_workers)
+                    else:
+                        # Step 3: Analyze every article concurrently
+                        status_text.text(f"⚡ Analyzing {len(articles)} articles...")
+                        progress_bar.progress(75)
                         
-                        Provide a comprehensive analysis in JSON format with:
-                        - title: Extract or create a compelling headline
-                        - article: The main article content (summarized if too long)
-                        - ai_summary: 2-sentence maximum summary
-                        - sentiment_analysis: Classify as Positive, Negative, or Neutral with brief reasoning
-                        - key_topics: List 3-5 main topics/themes
-                        - credibility_assessment: Assess source reliability and fact accuracy
-                        - pidgin_version: Translate summary to Nigerian Pidgin English
+                        result = analyze_news(my_tool, query, llm=llm, max_workers=max_workers,
+                                              use_cache=use_cache, use_firestore_cache=use_cache)
                         
-                        Format as valid JSON:
-                        {{
-                            "title": "string",
-                            "article": "string", 
-                            "ai_summary": "string",
-                            "sentiment_analysis": "string",
-                            "key_topics": "string",
-                            "credibility_assessment": "string",
-                            "pidgin_version": "string"
-                        }}
-                        """
-                    )
-                    
-                    prompt = prompt_template.format(context=my_tool)
-                    
-                    # Step 3: Get AI response
-                    status_text.text("⚡ Generating analysis...")
-                    progress_bar.progress(75)
-                    
-                    response = llm.invoke(prompt)
-                    
-                    # Step 4: Parse results
-                    status_text.text("📊 Processing results...")
-                    progress_bar.progress(100)
-                    
-                    parsed_result = parser.parse(response)
-                    
-                    # Add metadata
-                    parsed_result.timestamp = datetime.datetime.now().isoformat()
-                    parsed_result.country = query.title()
-                    parsed_result.confidence_score = calculate_credibility_score(parsed_result.credibility_assessment)
-                    
-                    # Clear loading state
-                    progress_bar.empty()
-                    status_text.empty()
-                    
-                    # Display results
-                    display_news_analysis(parsed_result, query)
+                        # Step 4: Results
+                        status_text.text("📊 Processing results...")
+                        progress_bar.progress(100)
+                        
+                        # Clear loading state
+                        progress_bar.empty()
+                        status_text.empty()
+                        
+                        if not result.ok:
+                            raise ValueError(result.error)
+                        
+                        # Display results
+                        display_article_results(result, show_raw_response)
+                        news_list = result.news
                     
                     # Save to database
                     if save_to_db:
                         try:
-                            # Convert Pydantic model to dictionary
-                            if hasattr(parsed_result, 'model_dump'):
-                                news_data = parsed_result.model_dump()  # Pydantic v2
-                            elif hasattr(parsed_result, 'dict'):
-                                news_data = parsed_result.dict()  # Pydantic v1
-                            else:
-                                # Manual conversion as fallback
-                                news_data = {
-                                    'title': parsed_result.title,
-                                    'article': parsed_result.article,
-                                    'ai_summary': parsed_result.ai_summary,
-                                    'sentiment_analysis': parsed_result.sentiment_analysis,
-                                    'key_topics': parsed_result.key_topics,
-                                    'credibility_assessment': parsed_result.credibility_assessment,
-                                    'pidgin_version': parsed_result.pidgin_version,
-                                    'timestamp': parsed_result.timestamp,
-                                    'country': parsed_result.country,
-                                    'confidence_score': parsed_result.confidence_score
-                                }
-                            
-                            # Debug: Show what we're trying to save
-                            # st.write("Debug - Data to save:", news_data)
-                            
-                            # Add to Firestore
-                            doc_ref = db.collection("news_articles").add(news_data)
-                            doc_id = doc_ref[1].id if isinstance(doc_ref, tuple) else doc_ref.id
-                            # st.markdown(f'<div class="alert-success">✅ Analysis saved to database successfully! Document ID: {doc_id}</div>', unsafe_allow_html=True)
+                            # Add to Firestore (analyses already stored there are skipped)
+                            doc_ids = save_analyses(news_list)
+                            # st.markdown(f'<div class="alert-success">✅ Analysis saved to database successfully! Document IDs: {doc_ids}</div>', unsafe_allow_html=True)
                             
                         except Exception as e:
                             st.markdown(f'<div class="alert-error">⚠️ Error saving to database: {str(e)}</div>', unsafe_allow_html=True)
                             st.write("Debug - Error details:", str(e))
-                            st.write("Debug - Parsed result type:", type(parsed_result))
-                            st.write("Debug - Parsed result:", parsed_result)
-                    
-                    # Show raw response if requested
-                    if show_raw_response:
-                        with st.expander("🔍 Raw AI Response"):
-                            st.code(response, language="json")
                     
                 except Exception as e:
                     progress_bar.empty()
                     status_text.empty()
                     st.markdown(f'<div class="alert-error">⚠️ Analysis failed: {str(e)}</div>', unsafe_allow_html=True)
                     if show_raw_response:
-                        st.code(str(response) if 'response' in locals() else "No response available", language="text")
+                        st.code(str(my_tool) if 'my_tool' in locals() else "No response available", language="text")
     
     elif page == "Analytics Dashboard":
         display_analytics()
@@ -582,55 +695,7 @@ def main():
     elif page == "History":
         st.markdown('<div class="main-header"><h1>📚 Analysis History</h1><p>Review your previous news analyses</p></div>', unsafe_allow_html=True)
         
-        data = load_analytics_data()
-        if data:
-            # Get unique values for filters
-            countries = list(set(item.get('country') for item in data if item.get('country')))
-            sentiments = list(set(item.get('sentiment_analysis') for item in data if item.get('sentiment_analysis')))
-            
-            # Filters
-            col1, col2, col3 = st.columns(3)
-            with col1:
-                country_filter = st.selectbox("Filter by Country:", ["All"] + countries)
-            with col2:
-                sentiment_filter = st.selectbox("Filter by Sentiment:", ["All"] + sentiments)
-            with col3:
-                sort_by = st.selectbox("Sort by:", ["Timestamp", "Country", "Credibility"])
-            
-            # Apply filters
-            filtered_data = data.copy()
-            if country_filter != "All":
-                filtered_data = [item for item in filtered_data if item.get('country') == country_filter]
-            if sentiment_filter != "All":
-                filtered_data = [item for item in filtered_data if item.get('sentiment_analysis') == sentiment_filter]
-            
-            # Sort data
-            if sort_by == "Timestamp":
-                filtered_data.sort(key=lambda x: x.get('timestamp', ''), reverse=True)
-            elif sort_by == "Country":
-                filtered_data.sort(key=lambda x: x.get('country', ''))
-            elif sort_by == "Credibility":
-                filtered_data.sort(key=lambda x: x.get('confidence_score', 0), reverse=True)
-            
-            # Display results
-            for item in filtered_data:
-                title = item.get('title', 'Untitled')
-                country = item.get('country', 'Unknown')
-                timestamp = item.get('timestamp', 'Unknown')
-                if timestamp != 'Unknown':
-                    timestamp = timestamp.split('T')[0]  # Show only date
-                
-                with st.expander(f"📰 {title} - {country} ({timestamp})"):
-                    col1, col2 = st.columns([2, 1])
-                    with col1:
-                        st.write(f"**Summary:** {item.get('ai_summary', 'N/A')}")
-                        st.write(f"**Pidgin:** {item.get('pidgin_version', 'N/A')}")
-                    with col2:
-                        st.write(f"**Sentiment:** {item.get('sentiment_analysis', 'N/A')}")
-                        st.write(f"**Topics:** {item.get('key_topics', 'N/A')}")
-                        st.write(f"**Credibility:** {item.get('credibility_assessment', 'N/A')}")
-        else:
-            st.info("No history available yet. Start analyzing some news!")
+        display_history()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
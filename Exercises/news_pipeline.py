@@ -0,0 +1,469 @@
+import os
+import json
+import hashlib
+import argparse
+import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import List, Optional
+from pydantic import BaseModel
+from langchain_core.prompts import PromptTemplate
+from config import load_google_llm, batch_news_context, SQLiteCache, StreamingPydanticParser
+from news_schema import News, normalize_sentiment, split_topics, country_code
+from news_scoring import calculate_credibility_score
+
+# -------------------------------
+# Pydantic Models
+# -------------------------------
+# What the LLM has to generate for one article (title/article come from the API)
+class ArticleAnalysis(BaseModel):
+    ai_summary: str
+    sentiment_analysis: str
+    key_topics: str
+    credibility_assessment: str
+    pidgin_version: str
+    credibility_score: Optional[float] = None
+
+prompt_template = PromptTemplate.from_template(
+    """
+    You are an expert news analyst. Analyze the following news article.
+
+    Title: {title}
+    Source: {source}
+    Published: {published_at}
+    Text: {text}
+
+    Provide the analysis in JSON format with:
+    - ai_summary: 2-sentence maximum summary
+    - sentiment_analysis: Classify as Positive, Negative, or Neutral with brief reasoning
+    - key_topics: List 3-5 main topics/themes
+    - credibility_assessment: Assess source reliability and fact accuracy
+    - credibility_score: Your credibility rating as a number from 0.0 (not credible) to 1.0 (highly credible)
+    - pidgin_version: Translate summary to Nigerian Pidgin English
+
+    Format as valid JSON:
+    {{
+        "ai_summary": "string",
+        "sentiment_analysis": "string",
+        "key_topics": "string",
+        "credibility_assessment": "string",
+        "credibility_score": 0.0,
+        "pidgin_version": "string"
+    }}
+    """
+)
+
+# -------------------------------
+# Article extraction
+# -------------------------------
+# Rough budget for the article text in one prompt (~4 characters per token)
+ARTICLE_TOKEN_BUDGET = 600
+MAX_ARTICLES = 5
+CHARS_PER_TOKEN = 4
+
+# newsdata.io puts this in restricted fields on the free plan
+PAID_PLAN_PLACEHOLDER = "ONLY AVAILABLE IN PAID PLANS"
+
+def estimate_tokens(text):
+    return len(text) // CHARS_PER_TOKEN + 1
+
+def truncate_to_budget(text, token_budget=ARTICLE_TOKEN_BUDGET):
+    """Cut text to roughly token_budget tokens, on a sentence or word boundary"""
+    max_chars = token_budget * CHARS_PER_TOKEN
+    if len(text) <= max_chars:
+        return text
+    cut = text[:max_chars]
+    boundary = max(cut.rfind(". "), cut.rfind("\n"))
+    if boundary < max_chars // 2:
+        boundary = cut.rfind(" ")
+    return cut[:boundary + 1].rstrip() + " ..." if boundary > 0 else cut
+
+def _clean(value):
+    if not isinstance(value, str) or PAID_PLAN_PLACEHOLDER in value:
+        return ""
+    return " ".join(value.split())
+
+def _dedupe_key(article):
+    title = "".join(ch for ch in article["title"].lower() if ch.isalnum())
+    return title or article["link"]
+
+def extract_articles(payload, max_articles=MAX_ARTICLES, token_budget=ARTICLE_TOKEN_BUDGET):
+    """Pick the fields we need from a newsdata.io response, deduplicated and truncated"""
+    if not isinstance(payload, dict):
+        raise ValueError("Unexpected news API response")
+    if payload.get("status") not in (None, "success"):
+        results = payload.get("results")
+        message = results.get("message") if isinstance(results, dict) else payload.get("status")
+        raise ValueError(f"News API error: {message}")
+
+    articles = []
+    seen = set()
+    for item in payload.get("results") or []:
+        # Prefer the full content, fall back to the description
+        text = _clean(item.get("content")) or _clean(item.get("description"))
+        article = {
+            "title": _clean(item.get("title")),
+            "text": truncate_to_budget(text, token_budget),
+            "source": _clean(item.get("source_name")) or _clean(item.get("source_id")),
+            "link": item.get("link") or "",
+            "published_at": item.get("pubDate") or "",
+        }
+        if not article["title"] and not article["text"]:
+            continue
+        # Syndicated stories show up several times under different links
+        keys = {_dedupe_key(article), article["link"]} - {""}
+        if keys & seen:
+            continue
+        seen |= keys
+        articles.append(article)
+        if len(articles) >= max_articles:
+            break
+    return articles
+
+# -------------------------------
+# Analysis
+# -------------------------------
+def build_prompt(article):
+    return prompt_template.format(
+        title=article["title"] or "(untitled)",
+        source=article["source"] or "unknown",
+        published_at=article["published_at"] or "unknown",
+        text=article["text"] or "(no text, use the title)",
+    )
+
+def build_news(fields, article, country, analysis_key=None, from_cache=False, stored=False):
+    """Combine the LLM fields of one article with the article itself and metadata"""
+    now = datetime.datetime.now()
+    return News(
+        title=article["title"] or "Untitled",
+        article=article["text"],
+        source=article["source"] or None,
+        link=article["link"] or None,
+        published_at=article["published_at"] or None,
+        timestamp=now.isoformat(),
+        timestamp_epoch=now.timestamp(),
+        country=country.title(),
+        country_code=country_code(country),
+        sentiment=normalize_sentiment(fields["sentiment_analysis"]),
+        topics=split_topics(fields["key_topics"]),
+        confidence_score=calculate_credibility_score(fields["credibility_assessment"],
+                                                     fields.get("credibility_score")),
+        analysis_key=analysis_key,
+        from_cache=from_cache,
+        stored=stored,
+        **fields,
+    )
+
+# -------------------------------
+# Analysis Cache
+# -------------------------------
+# Bump when the prompt or the ArticleAnalysis fields change, old entries then stop matching
+PROMPT_VERSION = "article-v2"
+ANALYSIS_CACHE_TTL = 24 * 60 * 60
+ANALYSIS_CACHE_PATH = os.path.join(".cache", "news_analysis.sqlite")
+
+def analysis_key(article, model_name):
+    """Hash of the normalized article, the prompt version and the model"""
+    normalized = {name: " ".join(str(article.get(name) or "").lower().split())
+                  for name in ("title", "text", "source", "link")}
+    payload = json.dumps([normalized, PROMPT_VERSION, model_name], sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class AnalysisCache:
+    """LLM analyses by analysis_key: local SQLite first, optionally the stored Firestore documents
+
+    Every LLM run is cached locally, saved to Firestore or not, so each entry
+    also records whether the analysis is known to be stored there.
+    """
+
+    def __init__(self, path=ANALYSIS_CACHE_PATH, ttl=ANALYSIS_CACHE_TTL, max_entries=50_000):
+        self.ttl = ttl
+        self.local = SQLiteCache(path, max_entries=max_entries, ttl=ttl, table="news_analysis")
+
+    def get(self, key, use_firestore=False):
+        """(fields, stored) or None"""
+        value = self.local.get(key)
+        if value is not None:
+            return self._decode(value)
+        if use_firestore:
+            from news_store import find_analysis
+            fields = find_analysis(key, max_age=self.ttl)
+            if fields is not None:
+                # Keep a local copy so the next lookup skips Firestore
+                self.set(key, fields, stored=True)
+                return fields, True
+        return None
+
+    @staticmethod
+    def _decode(value):
+        entry = json.loads(value)
+        if "fields" not in entry:
+            # Entry written before the stored flag existed: save it to be safe
+            return entry, False
+        return entry["fields"], entry["stored"]
+
+    @staticmethod
+    def _encode(fields, stored):
+        return json.dumps({"fields": fields, "stored": stored})
+
+    def set(self, key, fields, stored=False):
+        self.local.set(key, self._encode(fields, stored))
+
+    def mark_stored(self, keys):
+        found = self.local.get_many(keys)
+        self.local.set_many((key, self._encode(self._decode(value)[0], True)) for key, value in found.items())
+
+    def stats(self):
+        return self.local.stats()
+
+analysis_cache = AnalysisCache()
+
+def analyze_article(article, country, llm=None, use_cache=True, use_firestore_cache=False):
+    """Run one article analysis, returns (News, raw response)
+
+    A cached analysis of the same article is returned without any LLM call
+    (raw response is then None and news.from_cache is True; news.stored tells
+    whether it is already in Firestore).
+    """
+    llm = llm or load_google_llm()
+    key = analysis_key(article, getattr(llm, "model", "unknown"))
+    if use_cache:
+        cached = analysis_cache.get(key, use_firestore=use_firestore_cache)
+        if cached is not None:
+            fields, stored = cached
+            return build_news(fields, article, country, key, from_cache=True, stored=stored), None
+
+    # Parsed field by field; only missing/invalid fields are asked for again
+    structured = StreamingPydanticParser(ArticleAnalysis)
+    analysis = structured.invoke(llm, build_prompt(article))
+    return _finish_analysis(analysis, article, country, key, use_cache), structured.text
+
+def _finish_analysis(analysis, article, country, key, use_cache):
+    news = build_news(analysis.model_dump(), article, country, key)
+    if use_cache:
+        analysis_cache.set(key, {name: getattr(news, name) for name in ArticleAnalysis.model_fields})
+    return news
+
+def stream_article(article, country, llm=None, use_cache=True, use_firestore_cache=False):
+    """Analyze one article while the model generates, for live rendering
+
+    Yields ("partial", fields, completed) after every chunk, where fields are the
+    ArticleAnalysis values parsed so far (the last one may still be growing) and
+    completed the names that are final, then ("done", news, raw response).
+    """
+    llm = llm or load_google_llm()
+    key = analysis_key(article, getattr(llm, "model", "unknown"))
+    if use_cache:
+        cached = analysis_cache.get(key, use_firestore=use_firestore_cache)
+        if cached is not None:
+            fields, stored = cached
+            yield "done", build_news(fields, article, country, key, from_cache=True, stored=stored), None
+            return
+
+    structured = StreamingPydanticParser(ArticleAnalysis)
+    for analysis in structured.stream(llm, build_prompt(article), every_chunk=True):
+        # Validated fields plus the one being written (also during a repair request)
+        fields = {**structured.values, **structured.fields}
+        completed = set(structured.values) | set(structured.completed)
+        yield "partial", fields, completed
+    yield "done", _finish_analysis(analysis, article, country, key, use_cache), structured.text
+
+@dataclass
+class AnalysisResult:
+    country: str
+    news: List[News] = field(default_factory=list)
+    raw_responses: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    def _article_done(self, future):
+        try:
+            news, response = future.result()
+            self.news.append(news)
+            self.raw_responses.append(response)
+        except Exception as e:
+            self.errors.append(f"Analysis failed: {e}")
+
+def analyze_news(payload, country, llm=None, max_workers=4, max_articles=MAX_ARTICLES,
+                 use_cache=True, use_firestore_cache=False):
+    """Analyze every article of one news API response concurrently"""
+    result = AnalysisResult(country.title())
+    try:
+        articles = extract_articles(payload, max_articles)
+    except Exception as e:
+        result.error = str(e)
+        return result
+    if not articles:
+        result.error = "No articles found"
+        return result
+
+    llm = llm or load_google_llm()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [executor.submit(analyze_article, article, country, llm, use_cache, use_firestore_cache)
+                   for article in articles]
+        # Keep the API's article order
+        for future in futures:
+            result._article_done(future)
+    if not result.news:
+        result.error = "; ".join(result.errors) or "Analysis failed"
+    return result
+
+# -------------------------------
+# Batch Mode
+# -------------------------------
+def save_analyses(news_list):
+    """Store the analyses not yet in Firestore, returns the new document ids
+
+    The local cache also holds runs that were never saved (save unchecked,
+    --no-save), so only records known to be stored are skipped. Records are
+    marked stored one commit at a time: if a later commit fails, the ones
+    already written are not written again on the next save.
+    """
+    from news_store import save_news_batch, ARTICLES_PER_COMMIT
+    pending = [news for news in news_list if not news.stored]
+    doc_ids = []
+    for start in range(0, len(pending), ARTICLES_PER_COMMIT):
+        chunk = pending[start:start + ARTICLES_PER_COMMIT]
+        doc_ids.extend(save_news_batch(chunk))
+        analysis_cache.mark_stored([news.analysis_key for news in chunk if news.analysis_key])
+        for news in chunk:
+            news.stored = True
+    return doc_ids
+
+def parse_country_list(text):
+    """Split comma / newline separated input, dropping blanks and duplicates"""
+    countries = [part.strip().title() for part in text.replace("\n", ",").split(",")]
+    return list(dict.fromkeys(country for country in countries if country))
+
+def analyze_countries(countries, max_workers=4, fetch_concurrency=8, save=True,
+                      write_batch_size=20, max_articles=MAX_ARTICLES, use_cache=True,
+                      use_firestore_cache=False, on_progress=None):
+    """Analyze many countries at once.
+
+    News for all countries is fetched concurrently, every article of every
+    country goes through one bounded worker pool, results are handled as
+    they complete and finished analyses are committed to Firestore in
+    batched writes. A failed write is recorded in the errors of the countries
+    it held and the batch goes on; those analyses stay unsaved (news.stored
+    is False) and a later run saves them from the local cache, no LLM call.
+    on_progress is called with (AnalysisResult, done, total) from the
+    calling thread once a country is complete.
+    Returns one AnalysisResult per country, in input order.
+    """
+    countries = list(dict.fromkeys(countries))
+    total = len(countries)
+    results = {country: AnalysisResult(country.title()) for country in countries}
+    remaining = {}
+    pending_writes = []
+    done = 0
+
+    def flush():
+        # Every LLM call is already paid for: a Firestore error must not stop the batch
+        batch = [news for _, news in pending_writes]
+        try:
+            save_analyses(batch)
+        except Exception as e:
+            for country in dict.fromkeys(country for country, news in pending_writes if not news.stored):
+                results[country].errors.append(f"Saving to Firestore failed: {e}")
+        pending_writes.clear()
+
+    def finish(country):
+        nonlocal done
+        done += 1
+        result = results[country]
+        if result.error is None and not result.news:
+            result.error = "; ".join(result.errors) or "Analysis failed"
+        if result.ok and save:
+            # Analyses already in Firestore are skipped by save_analyses
+            pending_writes.extend((country, news) for news in result.news if not news.stored)
+            if len(pending_writes) >= write_batch_size:
+                flush()
+        if on_progress:
+            on_progress(result, done, total)
+
+    # Step 1: fetch news for every country at once
+    fetched = batch_news_context(countries, concurrency=fetch_concurrency)
+
+    # Step 2: analyze every article on one bounded pool, handling results as they complete
+    llm = load_google_llm()
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for item in fetched:
+            result = results[item.query]
+            if not item.ok:
+                result.error = f"Fetching news failed: {item.error}"
+                finish(item.query)
+                continue
+            try:
+                articles = extract_articles(item.data, max_articles)
+            except Exception as e:
+                articles = []
+                result.error = str(e)
+            if not articles:
+                result.error = result.error or "No articles found"
+                finish(item.query)
+                continue
+            remaining[item.query] = len(articles)
+            for article in articles:
+                future = executor.submit(analyze_article, article, item.query, llm, use_cache, use_firestore_cache)
+                futures[future] = item.query
+
+        for future in as_completed(futures):
+            country = futures[future]
+            results[country]._article_done(future)
+            remaining[country] -= 1
+            if remaining[country] == 0:
+                finish(country)
+
+    # Step 3: commit whatever is left
+    if save and pending_writes:
+        flush()
+
+    return [results[country] for country in countries]
+
+# -------------------------------
+# Headless entry point (nightly job)
+#   python Exercises/news_pipeline.py Nigeria Ghana Kenya
+#   python Exercises/news_pipeline.py --file countries.txt --workers 8
+# -------------------------------
+def main():
+    arg_parser = argparse.ArgumentParser(description="Analyze the latest news for many countries")
+    arg_parser.add_argument("countries", nargs="*", help="country names")
+    arg_parser.add_argument("--file", help="file with one country per line (or comma separated)")
+    arg_parser.add_argument("--workers", type=int, default=4, help="LLM analyses running at once")
+    arg_parser.add_argument("--max-articles", type=int, default=MAX_ARTICLES, help="articles analyzed per country")
+    arg_parser.add_argument("--fetch-concurrency", type=int, default=8, help="news requests running at once")
+    arg_parser.add_argument("--no-save", action="store_true", help="do not write to Firestore")
+    arg_parser.add_argument("--no-cache", action="store_true", help="always call the LLM")
+    args = arg_parser.parse_args()
+
+    countries = parse_country_list(",".join(args.countries))
+    if args.file:
+        with open(args.file, "r", encoding="utf-8") as f:
+            countries = list(dict.fromkeys(countries + parse_country_list(f.read())))
+    if not countries:
+        arg_parser.error("no countries given")
+
+    def report(result, done, total):
+        cached = sum(news.from_cache for news in result.news)
+        status = f"✅ {len(result.news)} articles ({cached} from cache)" if result.ok else f"⚠️ {result.error}"
+        print(f"[{done}/{total}] {result.country}: {status}")
+
+    results = analyze_countries(countries, max_workers=args.workers, fetch_concurrency=args.fetch_concurrency,
+                                max_articles=args.max_articles, save=not args.no_save,
+                                use_cache=not args.no_cache, use_firestore_cache=not args.no_save,
+                                on_progress=report)
+    failed = [result.country for result in results if not result.ok]
+    print(f"Done: {len(results) - len(failed)} analyzed, {len(failed)} failed {failed if failed else ''}")
+    if not args.no_save:
+        unsaved = {result.country: sum(not news.stored for news in result.news) for result in results}
+        unsaved = {country: count for country, count in unsaved.items() if count}
+        if unsaved:
+            print(f"⚠️ Not saved to Firestore: {unsaved}, a later run saves them from the local cache")
+
+if __name__ == "__main__":
+    main()
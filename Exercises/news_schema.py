@@ -0,0 +1,126 @@
+import re
+from datetime import datetime
+from enum import Enum
+from typing import List, Optional
+from pydantic import BaseModel
+
+# Bumped when the stored document layout changes (documents without it are version 1)
+SCHEMA_VERSION = 2
+
+# -------------------------------
+# Normalized values
+# -------------------------------
+class Sentiment(str, Enum):
+    POSITIVE = "Positive"
+    NEGATIVE = "Negative"
+    NEUTRAL = "Neutral"
+
+def normalize_sentiment(text):
+    """Map the free-text sentiment analysis to a Sentiment"""
+    text_lower = (text or "").lower()
+    if 'positive' in text_lower:
+        return Sentiment.POSITIVE
+    elif 'negative' in text_lower:
+        return Sentiment.NEGATIVE
+    return Sentiment.NEUTRAL
+
+_TOPIC_SEPARATORS = re.compile(r"[,;\n]|\s-\s|•")
+
+def split_topics(text, max_topics=8):
+    """'Economy, Elections; Health' -> ['Economy', 'Elections', 'Health']"""
+    topics = []
+    for part in _TOPIC_SEPARATORS.split(text or ""):
+        # Drop list markers like "1." or "-" and surrounding punctuation
+        topic = re.sub(r"^\s*(\d+[.)]|[-*])\s*", "", part).strip(" .\t\"'")
+        if topic and topic.lower() not in (t.lower() for t in topics):
+            topics.append(topic)
+    return topics[:max_topics]
+
+# ISO 3166-1 alpha-2 codes for the countries the analyzer is used with most
+COUNTRY_CODES = {
+    "Algeria": "DZ", "Angola": "AO", "Benin": "BJ", "Botswana": "BW", "Burkina Faso": "BF",
+    "Burundi": "BI", "Cameroon": "CM", "Central African Republic": "CF", "Chad": "TD",
+    "Congo": "CG", "Democratic Republic Of The Congo": "CD", "Dr Congo": "CD", "Ivory Coast": "CI",
+    "Cote D'Ivoire": "CI", "Egypt": "EG", "Equatorial Guinea": "GQ", "Eritrea": "ER", "Ethiopia": "ET",
+    "Gabon": "GA", "Gambia": "GM", "Ghana": "GH", "Guinea": "GN", "Kenya": "KE", "Liberia": "LR",
+    "Libya": "LY", "Madagascar": "MG", "Malawi": "MW", "Mali": "ML", "Mauritania": "MR",
+    "Morocco": "MA", "Mozambique": "MZ", "Namibia": "NA", "Niger": "NE", "Nigeria": "NG",
+    "Rwanda": "RW", "Senegal": "SN", "Sierra Leone": "SL", "Somalia": "SO", "South Africa": "ZA",
+    "South Sudan": "SS", "Sudan": "SD", "Tanzania": "TZ", "Togo": "TG", "Tunisia": "TN",
+    "Uganda": "UG", "Zambia": "ZM", "Zimbabwe": "ZW",
+    "United States": "US", "Usa": "US", "United Kingdom": "GB", "Uk": "GB", "Canada": "CA",
+    "France": "FR", "Germany": "DE", "Italy": "IT", "Spain": "ES", "Portugal": "PT",
+    "Netherlands": "NL", "Belgium": "BE", "China": "CN", "India": "IN", "Japan": "JP",
+    "Brazil": "BR", "Mexico": "MX", "Russia": "RU", "Ukraine": "UA", "Australia": "AU",
+    "Saudi Arabia": "SA", "United Arab Emirates": "AE", "Israel": "IL", "Turkey": "TR",
+}
+
+def country_code(country):
+    if not country:
+        return None
+    return COUNTRY_CODES.get(country.strip().title())
+
+# -------------------------------
+# Pydantic Models
+# -------------------------------
+class News(BaseModel):
+    title: str
+    article: str
+    ai_summary: str
+    sentiment_analysis: str
+    key_topics: str
+    credibility_assessment: str  # Fixed spelling
+    pidgin_version: str
+    timestamp: Optional[str] = None
+    country: Optional[str] = None
+    confidence_score: Optional[float] = None  # numeric credibility, 0-1
+    credibility_score: Optional[float] = None  # the model's own rating, when it gave one
+    source: Optional[str] = None
+    link: Optional[str] = None
+    published_at: Optional[str] = None
+    analysis_key: Optional[str] = None
+    # Normalized fields, filled at analysis time so readers never re-derive them
+    sentiment: Optional[Sentiment] = None
+    topics: List[str] = []
+    country_code: Optional[str] = None
+    timestamp_epoch: Optional[float] = None
+    # Set when the analysis was served from the cache (never stored)
+    from_cache: bool = False
+    # Set once the analysis is known to be in Firestore, saves skip it (never stored)
+    stored: bool = False
+
+    class Config:
+        # For Pydantic v1 compatibility
+        allow_population_by_field_name = True
+
+# -------------------------------
+# Storage layout
+# -------------------------------
+# news_articles/{id}: small summary document, all list and analytics queries read only these
+SUMMARY_FIELDS = (
+    "title", "ai_summary", "country", "country_code", "sentiment", "topics", "confidence_score",
+    "credibility_score", "timestamp", "timestamp_epoch", "source", "link", "published_at", "analysis_key",
+)
+# news_articles/{id}/details/full: the large text fields, read only when a row is opened
+DETAIL_FIELDS = ("article", "pidgin_version", "sentiment_analysis", "key_topics", "credibility_assessment")
+DETAILS_COLLECTION = "details"
+DETAILS_DOCUMENT = "full"
+
+def split_for_storage(news):
+    """Return (summary, details) dictionaries for one News record"""
+    data = news.model_dump(mode="json") if hasattr(news, "model_dump") else news.dict()
+    summary = {name: data.get(name) for name in SUMMARY_FIELDS}
+    summary["schema_version"] = SCHEMA_VERSION
+    details = {name: data.get(name) for name in DETAIL_FIELDS}
+    return summary, details
+
+def normalize_legacy(data):
+    """Normalized fields for a document stored before SCHEMA_VERSION 2"""
+    normalized = {
+        "sentiment": normalize_sentiment(data.get("sentiment_analysis")).value,
+        "topics": split_topics(data.get("key_topics")),
+        "country_code": country_code(data.get("country")),
+    }
+    if data.get("timestamp"):
+        normalized["timestamp_epoch"] = datetime.fromisoformat(data["timestamp"]).timestamp()
+    return normalized
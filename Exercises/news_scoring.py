@@ -0,0 +1,85 @@
+import re
+
+# -------------------------------
+# Credibility Scoring
+# -------------------------------
+# Weighted terms looked for in the free-text credibility assessment.
+# Positive weights push the score up, negative ones down; moderate terms pull it
+# towards the middle. Negated phrases ("not reliable") are matched before single words.
+CREDIBILITY_TERMS = {
+    # negated
+    "not reliable": -0.3, "not credible": -0.3, "not trustworthy": -0.3, "not verified": -0.2,
+    "cannot be verified": -0.2, "lacks credibility": -0.3, "lack of sources": -0.2,
+    # low
+    "low": -0.25, "unreliable": -0.3, "unverified": -0.2, "questionable": -0.2, "dubious": -0.25,
+    "biased": -0.15, "misleading": -0.3, "false": -0.3, "rumor": -0.2, "rumour": -0.2,
+    "satire": -0.3, "sensational": -0.15, "anonymous": -0.1, "unknown source": -0.15,
+    # moderate
+    "medium": 0.0, "moderate": 0.0, "moderately": 0.0, "fair": 0.0, "mixed": 0.0, "partially": 0.0,
+    # high
+    "high": 0.25, "highly": 0.15, "reliable": 0.2, "credible": 0.2, "trustworthy": 0.2,
+    "reputable": 0.2, "verified": 0.15, "well-sourced": 0.15, "established": 0.1, "official": 0.1,
+    "accurate": 0.1, "factual": 0.1,
+}
+MODERATE_PULL = 0.1
+BASE_SCORE = 0.5
+MIN_SCORE, MAX_SCORE = 0.05, 0.99
+# A negator up to NEGATION_WINDOW words before a term flips a positive term ("not highly
+# reliable") and cancels a negative one ("not biased"); the window stops at punctuation,
+# "but" and conjunctions, so in "not biased and reliable" only "biased" is negated
+NEGATORS = frozenset("""
+not no never hardly barely isn't isnt aren't wasn't weren't cannot can't lacks lacking without
+""".split())
+NEGATION_WINDOW = 3
+_CLAUSE_BREAK = re.compile(r"[,.;:!?()]|\b(?:but|however|although|and|or|nor)\b")
+
+class CredibilityScorer:
+    """Deterministic credibility score (0-1) from assessment text.
+
+    The same assessment always gets the same score, in every process, so
+    stored scores, caches and aggregates are reproducible. The term regex is
+    compiled once; score_batch scores many assessments in one pass.
+    """
+
+    def __init__(self, terms=CREDIBILITY_TERMS):
+        self.terms = {term.lower(): weight for term, weight in terms.items()}
+        # Longest first so "not reliable" wins over "reliable"
+        alternation = "|".join(re.escape(term) for term in sorted(self.terms, key=len, reverse=True))
+        self.pattern = re.compile(rf"\b(?:{alternation})\b")
+
+    def score(self, assessment, model_score=None):
+        """Score one assessment; a valid numeric score from the model takes precedence"""
+        if isinstance(model_score, (int, float)) and 0.0 <= model_score <= 1.0:
+            return round(min(max(float(model_score), MIN_SCORE), MAX_SCORE), 3)
+
+        text = (assessment or "").lower()
+        score = BASE_SCORE
+        moderate = 0
+        for match in self.pattern.finditer(text):
+            weight = self.terms[match.group(0)]
+            if weight == 0.0:
+                moderate += 1
+            elif self._negated(text, match.start()):
+                weight = -weight if weight > 0 else 0.0
+            score += weight
+        if moderate:
+            # "moderate"/"fair" assessments land close to the middle
+            score += (BASE_SCORE + MODERATE_PULL - score) / 2
+        return round(min(max(score, MIN_SCORE), MAX_SCORE), 3)
+
+    @staticmethod
+    def _negated(text, start):
+        clause = _CLAUSE_BREAK.split(text[max(0, start - 60):start])[-1]
+        return any(word in NEGATORS for word in clause.split()[-NEGATION_WINDOW:])
+
+    def score_batch(self, assessments, model_scores=None):
+        """Score many assessments at once, same order as the input"""
+        if model_scores is None:
+            model_scores = [None] * len(assessments)
+        return [self.score(text, model) for text, model in zip(assessments, model_scores)]
+
+scorer = CredibilityScorer()
+
+def calculate_credibility_score(assessment, model_score=None):
+    """Calculate a numerical credibility score from text assessment"""
+    return scorer.score(assessment, model_score)
@@ -0,0 +1,394 @@
+import os
+import time
+import datetime
+import threading
+from collections import OrderedDict
+import firebase_admin
+from firebase_admin import credentials, firestore
+from google.cloud.firestore_v1.base_query import FieldFilter
+from news_schema import (
+    SCHEMA_VERSION,
+    DETAIL_FIELDS,
+    DETAILS_COLLECTION,
+    DETAILS_DOCUMENT,
+    normalize_sentiment,
+    normalize_legacy,
+    split_for_storage,
+)
+from news_scoring import scorer
+
+# ------------------------------- 
+# Firebase Setup
+# ------------------------------- 
+script_dir = os.path.dirname(__file__)
+key_path = os.path.join(script_dir, "serviceAccountKey.json")
+
+if not firebase_admin._apps:  # Prevent reinitialization
+    cred = credentials.Certificate(key_path)
+    firebase_admin.initialize_app(cred)
+
+db = firestore.client()
+
+NEWS_COLLECTION = "news_articles"
+# One small document with running totals, read by the Analytics Dashboard
+STATS_COLLECTION = "news_stats"
+STATS_DOCUMENT = "summary"
+# Firestore rejects batches / transactions with more than 500 writes
+MAX_BATCH_WRITES = 500
+# Each article is two writes (summary + details), plus one stats update per commit
+ARTICLES_PER_COMMIT = (MAX_BATCH_WRITES - 1) // 2
+# Documents read per query by the maintenance commands
+MAINTENANCE_PAGE_SIZE = 200
+
+# ------------------------------- 
+# Read Cache
+# ------------------------------- 
+# Lives in the module, so it is shared by every Streamlit session of the process
+READ_CACHE_TTL = 60
+# Set NEWS_LIVE_UPDATES=1 to keep the cache current through a Firestore listener
+LIVE_UPDATES = os.getenv("NEWS_LIVE_UPDATES", "0") == "1"
+
+class ReadCache:
+    """Read-through cache for Firestore reads with a short TTL and explicit invalidation.
+
+    Keys are tuples whose first item is the kind of read ("stats", "history",
+    "details"), so a write can drop only the kinds it affects.
+    """
+
+    def __init__(self, ttl=READ_CACHE_TTL, max_entries=1000):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._generation = 0
+        self._lock = threading.Lock()
+        self._watch = None
+
+    def get_or_load(self, key, loader):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self.ttl:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+            generation = self._generation
+        value = loader()
+        with self._lock:
+            # Don't keep a value read while an invalidation happened, it may be stale
+            if generation == self._generation:
+                self.put(key, value)
+        return value
+
+    def put(self, key, value):
+        # Caller holds the lock (or doesn't need it, see _on_stats_snapshot)
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, kinds=None):
+        """Drop cached reads of the given kinds (all of them when kinds is None)"""
+        with self._lock:
+            self._generation += 1
+            for key in list(self._entries):
+                if kinds is None or key[0] in kinds:
+                    del self._entries[key]
+
+    def watch_stats(self):
+        """Follow the stats document: every write (from any process) updates it"""
+        if self._watch is None:
+            self._watch = stats_ref().on_snapshot(self._on_stats_snapshot)
+
+    def _on_stats_snapshot(self, snapshots, changes, read_time):
+        # New totals arrive with the snapshot: refresh them in place, drop list pages
+        self.invalidate(("stats", "history"))
+        for snapshot in snapshots:
+            if snapshot.exists:
+                with self._lock:
+                    self.put(("stats",), snapshot.to_dict())
+
+read_cache = ReadCache()
+
+# ------------------------------- 
+# Writes
+# ------------------------------- 
+def stats_ref():
+    return db.collection(STATS_COLLECTION).document(STATS_DOCUMENT)
+
+def details_ref(doc_ref):
+    return doc_ref.collection(DETAILS_COLLECTION).document(DETAILS_DOCUMENT)
+
+def empty_stats():
+    return {
+        "total": 0,
+        "sentiment_counts": {},
+        "country_counts": {},
+        "confidence_sum": 0.0,
+        "confidence_count": 0,
+        "latest_timestamp": None,
+    }
+
+def add_to_stats(stats, data):
+    """Fold one stored analysis into the running totals"""
+    stats["total"] += 1
+    bucket = data.get('sentiment') or normalize_sentiment(data.get('sentiment_analysis')).value
+    stats["sentiment_counts"][bucket] = stats["sentiment_counts"].get(bucket, 0) + 1
+    country = data.get('country') or 'Unknown'
+    stats["country_counts"][country] = stats["country_counts"].get(country, 0) + 1
+    if data.get('confidence_score'):
+        stats["confidence_sum"] += data['confidence_score']
+        stats["confidence_count"] += 1
+    timestamp = data.get('timestamp')
+    if timestamp and (stats["latest_timestamp"] is None or timestamp > stats["latest_timestamp"]):
+        stats["latest_timestamp"] = timestamp
+    return stats
+
+@firestore.transactional
+def _write_with_stats(transaction, items):
+    # Read the totals, write the articles and the updated totals atomically
+    snapshot = stats_ref().get(transaction=transaction)
+    stats = snapshot.to_dict() if snapshot.exists else empty_stats()
+    for doc_ref, summary, details in items:
+        transaction.set(doc_ref, summary)
+        transaction.set(details_ref(doc_ref), details)
+        add_to_stats(stats, summary)
+    transaction.set(stats_ref(), stats)
+
+def save_news(news):
+    """Store one analysis, returns the new document id"""
+    return save_news_batch([news])[0]
+
+def save_news_batch(news_list):
+    """Store many analyses with batched transactional writes, returns the new document ids"""
+    collection = db.collection(NEWS_COLLECTION)
+    doc_ids = []
+    for start in range(0, len(news_list), ARTICLES_PER_COMMIT):
+        items = []
+        for news in news_list[start:start + ARTICLES_PER_COMMIT]:
+            doc_ref = collection.document()
+            # Small summary document + large text fields in details/full
+            summary, details = split_for_storage(news)
+            items.append((doc_ref, summary, details))
+            doc_ids.append(doc_ref.id)
+        _write_with_stats(db.transaction(), items)
+    # Totals and list pages changed, stored details did not
+    read_cache.invalidate(("stats", "history"))
+    return doc_ids
+
+def iter_pages(query, page_size=MAINTENANCE_PAGE_SIZE):
+    """Lists of at most page_size snapshots over the whole query, one short query per page
+
+    A single collection-wide stream() would stay open for the whole job and
+    time out on a large collection.
+    """
+    query = query.order_by("__name__")
+    last = None
+    while True:
+        page_query = query.start_after(last) if last is not None else query
+        page = list(page_query.limit(page_size).stream())
+        if not page:
+            return
+        yield page
+        if len(page) < page_size:
+            return
+        last = page[-1]
+
+def rebuild_stats():
+    """Recompute the stats document from every stored analysis"""
+    stats = empty_stats()
+    fields = ['sentiment', 'sentiment_analysis', 'country', 'confidence_score', 'timestamp']
+    for page in iter_pages(db.collection(NEWS_COLLECTION).select(fields)):
+        for doc in page:
+            add_to_stats(stats, doc.to_dict())
+    stats_ref().set(stats)
+    read_cache.invalidate(("stats",))
+    return stats
+
+# ------------------------------- 
+# History queries
+# ------------------------------- 
+# Filters and sorting run in Firestore, one page at a time. Composite indexes needed
+# (collection news_articles, create them in the Firebase console or firestore.indexes.json):
+#   country ASC,   timestamp DESC
+#   sentiment ASC, timestamp DESC
+#   country ASC,   sentiment ASC, timestamp DESC
+#   country ASC,   confidence_score DESC
+#   sentiment ASC, confidence_score DESC
+#   country ASC,   sentiment ASC, confidence_score DESC
+#   sentiment ASC, country ASC
+# Unfiltered sorts only use the automatic single-field indexes.
+HISTORY_SORTS = {
+    "Timestamp": ("timestamp", firestore.Query.DESCENDING),
+    "Country": ("country", firestore.Query.ASCENDING),
+    "Credibility": ("confidence_score", firestore.Query.DESCENDING),
+}
+SENTIMENTS = ["Positive", "Negative", "Neutral"]
+# Fields shown in the list; the rest is loaded when a row is opened
+HISTORY_LIST_FIELDS = ['title', 'country', 'timestamp', 'sentiment', 'topics', 'confidence_score', 'ai_summary']
+
+def query_history(country=None, sentiment=None, sort_by="Timestamp", page_size=20, start_after_id=None):
+    """Return (rows, next_cursor) for one History page.
+
+    rows is a list of (document id, summary fields); pass next_cursor as
+    start_after_id to get the following page (None on the last page).
+    """
+    key = ("history", country, sentiment, sort_by, page_size, start_after_id)
+    return read_cache.get_or_load(
+        key, lambda: _query_history(country, sentiment, sort_by, page_size, start_after_id))
+
+def _query_history(country, sentiment, sort_by, page_size, start_after_id):
+    collection = db.collection(NEWS_COLLECTION)
+    query = collection.select(HISTORY_LIST_FIELDS)
+    if country:
+        query = query.where(filter=FieldFilter('country', '==', country))
+    if sentiment:
+        query = query.where(filter=FieldFilter('sentiment', '==', sentiment))
+    field_name, direction = HISTORY_SORTS[sort_by]
+    # Ordering by a field pinned by an equality filter is pointless
+    if not (field_name == 'country' and country):
+        query = query.order_by(field_name, direction=direction)
+    if start_after_id:
+        cursor = collection.document(start_after_id).get()
+        if cursor.exists:
+            query = query.start_after(cursor)
+
+    # One extra document tells us whether there is a next page
+    docs = list(query.limit(page_size + 1).stream())
+    rows = [(doc.id, doc.to_dict()) for doc in docs[:page_size]]
+    next_cursor = rows[-1][0] if len(docs) > page_size else None
+    return rows, next_cursor
+
+def load_news_details(doc_id):
+    """Large text fields of one stored analysis"""
+    def load():
+        doc_ref = db.collection(NEWS_COLLECTION).document(doc_id)
+        snapshot = details_ref(doc_ref).get()
+        if snapshot.exists:
+            return snapshot.to_dict()
+        # Documents stored before the summary/details split keep everything inline
+        snapshot = doc_ref.get()
+        return snapshot.to_dict() if snapshot.exists else None
+    return read_cache.get_or_load(("details", doc_id), load)
+
+def load_stats():
+    """Read the running totals (one document read, or none when cached)"""
+    def load():
+        snapshot = stats_ref().get()
+        return snapshot.to_dict() if snapshot.exists else empty_stats()
+    return read_cache.get_or_load(("stats",), load)
+
+# Fields produced by the LLM for one article (see news_pipeline.ArticleAnalysis)
+ANALYSIS_FIELDS = ("ai_summary", "sentiment_analysis", "key_topics", "credibility_assessment", "pidgin_version")
+
+def find_analysis(analysis_key, max_age=None):
+    """Return the LLM fields of a stored analysis with this key, or None"""
+    docs = (db.collection(NEWS_COLLECTION)
+            .where(filter=FieldFilter("analysis_key", "==", analysis_key))
+            .limit(1)
+            .stream())
+    for doc in docs:
+        data = doc.to_dict()
+        if max_age is not None and data.get("timestamp"):
+            age = datetime.datetime.now() - datetime.datetime.fromisoformat(data["timestamp"])
+            if age.total_seconds() > max_age:
+                return None
+        details = load_news_details(doc.id) or {}
+        data.update(details)
+        if all(name in data for name in ANALYSIS_FIELDS):
+            fields = {name: data[name] for name in ANALYSIS_FIELDS}
+            fields["credibility_score"] = data.get("credibility_score")
+            return fields
+    return None
+
+if LIVE_UPDATES:
+    read_cache.watch_stats()
+
+# ------------------------------- 
+# Maintenance commands
+#   python Exercises/news_store.py rebuild-stats
+#   python Exercises/news_store.py migrate-schema
+#   python Exercises/news_store.py rescore
+# ------------------------------- 
+def migrate_schema():
+    """Bring documents stored before SCHEMA_VERSION 2 to the summary/details layout"""
+    migrated = 0
+    writes = 0
+    batch = db.batch()
+    for page in iter_pages(db.collection(NEWS_COLLECTION)):
+        for doc in page:
+            data = doc.to_dict()
+            if data.get('schema_version', 1) >= SCHEMA_VERSION:
+                continue
+            details = {name: data.get(name) for name in DETAIL_FIELDS if name in data}
+            update = normalize_legacy(data)
+            update['schema_version'] = SCHEMA_VERSION
+            for name in details:
+                update[name] = firestore.DELETE_FIELD
+            batch.set(details_ref(doc.reference), details)
+            batch.update(doc.reference, update)
+            migrated += 1
+            writes += 2
+            if writes >= MAX_BATCH_WRITES - 1:
+                batch.commit()
+                batch = db.batch()
+                writes = 0
+    batch.commit()
+    read_cache.invalidate()
+    return migrated
+
+def rescore_credibility(page_size=MAINTENANCE_PAGE_SIZE):
+    """Recompute confidence_score of every stored analysis with the deterministic scorer"""
+    summary_fields = ['confidence_score', 'credibility_score', 'credibility_assessment', 'schema_version']
+    rescored = 0
+    for page in iter_pages(db.collection(NEWS_COLLECTION).select(summary_fields), page_size):
+        rows = [doc.to_dict() for doc in page]
+
+        # The assessment text lives in details/full (legacy documents still have it inline)
+        detail_refs = [details_ref(doc.reference) for doc, row in zip(page, rows)
+                       if 'credibility_assessment' not in row]
+        assessments = {}
+        if detail_refs:
+            for snapshot in db.get_all(detail_refs, field_paths=['credibility_assessment']):
+                if snapshot.exists:
+                    assessments[snapshot.reference.parent.parent.id] = snapshot.get('credibility_assessment')
+
+        texts = [row.get('credibility_assessment', assessments.get(doc.id)) for doc, row in zip(page, rows)]
+        scores = scorer.score_batch(texts, [row.get('credibility_score') for row in rows])
+
+        batch = db.batch()
+        writes = 0
+        for doc, row, score in zip(page, rows, scores):
+            if row.get('confidence_score') != score:
+                batch.update(doc.reference, {'confidence_score': score})
+                writes += 1
+        if writes:
+            batch.commit()
+        rescored += writes
+    # Averages in the stats document depend on the scores
+    rebuild_stats()
+    read_cache.invalidate()
+    return rescored
+
+def main():
+    import argparse
+    arg_parser = argparse.ArgumentParser(description="News Analyzer Firestore maintenance")
+    commands = arg_parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("rebuild-stats", help="recompute the analytics summary document")
+    commands.add_parser("migrate-schema", help="split and normalize documents stored with the old layout")
+    commands.add_parser("rescore", help="recompute credibility scores and rebuild the stats")
+    args = arg_parser.parse_args()
+
+    if args.command == "migrate-schema":
+        print(f"🗂️ {migrate_schema()} documents migrated to schema version {SCHEMA_VERSION}")
+
+    if args.command == "rescore":
+        print(f"🔁 {rescore_credibility()} credibility scores updated, stats rebuilt")
+
+    if args.command == "rebuild-stats":
+        stats = rebuild_stats()
+        print(f"📊 Stats rebuilt from {stats['total']} documents")
+
+if __name__ == "__main__":
+    main()
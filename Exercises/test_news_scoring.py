@@ -0,0 +1,27 @@
+# Credibility scorer checks, run with:  python -m pytest Exercises/test_news_scoring.py
+import pytest
+from news_scoring import scorer, BASE_SCORE
+
+@pytest.mark.parametrize("assessment, expected", [
+    # negation reaches the next term only
+    ("The source is not highly reliable", 0.15),
+    ("This is not a verified source", 0.35),
+    # ... and stops at conjunctions and punctuation
+    ("The source is not biased and reliable", 0.7),
+    ("Not false and verified by officials", 0.65),
+    ("not biased, reliable", 0.7),
+    ("not biased but reliable", 0.7),
+    # listed negated phrases and plain terms
+    ("Not reliable", 0.2),
+    ("Highly reliable and credible", 0.99),
+    ("unreliable and misleading", 0.05),
+    ("Moderately reliable", 0.65),
+    ("", BASE_SCORE),
+])
+def test_score(assessment, expected):
+    assert scorer.score(assessment) == expected
+
+def test_model_score_takes_precedence():
+    assert scorer.score("not reliable", model_score=0.8) == 0.8
+    # Out of range model scores fall back to the text
+    assert scorer.score("not reliable", model_score=7) == 0.2
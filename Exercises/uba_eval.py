@@ -0,0 +1,147 @@
+import json
+import time
+import argparse
+from config import (estimate_tokens, load_bm25_index, ContextCompressor, load_google_llm, BM25Index,
+                    CachedPDFLoader, build_text_splitter, iter_chunks, chunk_id, DomainRouter, calibrate_threshold)
+from uba_ingest import UBA_PERSIST_DIRECTORY, UBA_PDF_PATH, UBA_ROUTER_PATH
+import uba_rag
+
+EVAL_SET_PATH = "./data/uba_eval.json"
+# Questions the router must accept / reject, the uba_eval.json questions are added to in_domain
+ROUTING_SET_PATH = "./data/uba_routing.json"
+
+# -------------------------------
+# Retrieval modes
+# -------------------------------
+def lexical_retriever(bm25):
+    # BM25 only: no embedding calls, runs fully offline
+    def retrieve(question, k):
+        return [bm25.document(doc_id) for doc_id, _ in bm25.search(question, k)]
+    return retrieve
+
+def pdf_index(path=UBA_PDF_PATH):
+    # The PDF chunked as uba_ingest.py does, without a vector store or an API key
+    index = BM25Index()
+    for chunk in iter_chunks(CachedPDFLoader(path).load(), build_text_splitter()):
+        index.add(chunk_id(path, chunk.page_content), chunk.page_content, chunk.metadata)
+    return index
+
+def hybrid_retriever():
+    retriever = uba_rag.get_retriever()
+    return lambda question, k: retriever.get_relevant_documents(question, k=k)
+
+def contains_all(text, expected):
+    return all(item.lower() in text.lower() for item in expected)
+
+# -------------------------------
+# Evaluation
+# -------------------------------
+def evaluate(eval_set, retrieve, rerank, answers=False):
+    """Context hit rate (every expected string in the prompt context), context tokens, latency"""
+    compressor = ContextCompressor(top_n=uba_rag.CANDIDATES, token_budget=uba_rag.CONTEXT_TOKENS)
+    llm = load_google_llm() if answers else None
+    hits, answer_hits, tokens, seconds = 0, 0, 0, 0.0
+    for case in eval_set:
+        start = time.perf_counter()
+        if rerank:
+            docs = compressor.compress(case["question"], retrieve(case["question"], uba_rag.CANDIDATES))
+        else:
+            docs = retrieve(case["question"], uba_rag.TOP_K)
+        seconds += time.perf_counter() - start
+
+        context = "\n".join(doc.page_content for doc in docs)
+        hits += contains_all(context, case["expected"])
+        tokens += estimate_tokens(context)
+        if llm is not None:
+            answer = str(llm.invoke(uba_rag.build_prompt(case["question"], docs)))
+            answer_hits += contains_all(answer, case["expected"])
+
+    total = len(eval_set)
+    result = {
+        "context_hit_rate": hits / total,
+        "avg_context_tokens": tokens / total,
+        "avg_retrieval_ms": seconds / total * 1000,
+    }
+    if answers:
+        result["answer_hit_rate"] = answer_hits / total
+    return result
+
+def evaluate_routing(routing_set, eval_set, vocabulary, router=None):
+    """Accept/reject rates of the question router.
+
+    The vocabulary stage always runs (offline). With a full router the questions
+    it lets through are embedded and the similarity threshold is calibrated.
+    """
+    questions = {"in_domain": routing_set["in_domain"] + [case["question"] for case in eval_set],
+                 "off_topic": routing_set["off_topic"]}
+    lexical = DomainRouter(uba_rag.UBA_KEYWORDS, vocabulary=vocabulary, min_overlap=uba_rag.ROUTE_MIN_OVERLAP)
+    result, keyword_hits, to_embed, seconds = {}, {}, {}, 0.0
+    for name, items in questions.items():
+        start = time.perf_counter()
+        decisions = [lexical.route(question) for question in items]
+        seconds += time.perf_counter() - start
+        keyword_hits[name] = sum(bool(lexical.keyword_pattern.search(question)) for question in items)
+        # Accepted without a keyword: these go on to the similarity check
+        to_embed[name] = [question for question, decision in zip(items, decisions)
+                          if decision.accepted and not lexical.keyword_pattern.search(question)]
+        result[f"{name}_rejected_without_embedding"] = 1 - sum(d.accepted for d in decisions) / len(items)
+    result["avg_vocabulary_route_ms"] = seconds / sum(len(items) for items in questions.values()) * 1000
+
+    if router is not None:
+        in_scores = [router.similarity(question) for question in to_embed["in_domain"]]
+        off_scores = [router.similarity(question) for question in to_embed["off_topic"]]
+        threshold, _, _ = calibrate_threshold(in_scores, off_scores)
+        accepted = keyword_hits["in_domain"] + sum(score >= threshold for score in in_scores)
+        rejected = len(questions["off_topic"]) - keyword_hits["off_topic"] - sum(score >= threshold for score in off_scores)
+        result.update(threshold=threshold,
+                      in_domain_accepted=accepted / len(questions["in_domain"]),
+                      off_topic_rejected=rejected / len(questions["off_topic"]))
+    return result
+
+#   python Exercises/uba_eval.py --lexical-only
+#   python Exercises/uba_eval.py --pdf-only
+#   python Exercises/uba_eval.py --routing --save
+def main():
+    arg_parser = argparse.ArgumentParser(description="Compare plain top-k context with rerank + compression")
+    arg_parser.add_argument("--eval-set", default=EVAL_SET_PATH)
+    arg_parser.add_argument("--lexical-only", action="store_true", help="BM25 candidates only, no API calls")
+    arg_parser.add_argument("--pdf-only", action="store_true", help="BM25 over the UBA PDF alone, no index needed")
+    arg_parser.add_argument("--answers", action="store_true", help="also generate answers and check them")
+    arg_parser.add_argument("--routing", action="store_true", help="evaluate the question router instead")
+    arg_parser.add_argument("--save", action="store_true", help="with --routing, store the calibrated threshold")
+    args = arg_parser.parse_args()
+
+    with open(args.eval_set, encoding="utf-8") as f:
+        eval_set = json.load(f)
+    if args.routing:
+        with open(ROUTING_SET_PATH, encoding="utf-8") as f:
+            routing_set = json.load(f)
+        # Offline modes check the vocabulary stage only, no embedding calls
+        if args.pdf_only:
+            router, vocabulary = None, pdf_index().vocabulary
+        elif args.lexical_only:
+            router, vocabulary = None, load_bm25_index(UBA_PERSIST_DIRECTORY).vocabulary
+        else:
+            router = uba_rag.get_router()
+            vocabulary = router.vocabulary
+        result = evaluate_routing(routing_set, eval_set, vocabulary, router)
+        print("🧭 routing: " + ", ".join(f"{key}={value:.2f}" for key, value in result.items()))
+        if args.save and "threshold" in result:
+            with open(UBA_ROUTER_PATH, "w", encoding="utf-8") as f:
+                json.dump(result, f, indent=2)
+            print(f"💾 Threshold {result['threshold']:.3f} saved to {UBA_ROUTER_PATH}")
+        return
+    if args.pdf_only:
+        retrieve = lexical_retriever(pdf_index())
+    elif args.lexical_only:
+        retrieve = lexical_retriever(load_bm25_index(UBA_PERSIST_DIRECTORY, uba_rag.get_vector_db()))
+    else:
+        retrieve = hybrid_retriever()
+
+    print(f"📋 {len(eval_set)} questions")
+    for name, rerank in (("top-k", False), ("rerank+compress", True)):
+        result = evaluate(eval_set, retrieve, rerank, args.answers)
+        print(f"{name:>16}: " + ", ".join(f"{key}={value:.2f}" for key, value in result.items()))
+
+if __name__ == "__main__":
+    main()
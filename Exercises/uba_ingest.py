@@ -0,0 +1,70 @@
+import os
+import argparse
+from langchain_community.document_loaders import WebBaseLoader, WikipediaLoader
+from config import (ingest_sources, IngestSource, file_source, url_source, update_bm25_index, open_vector_store,
+                    SemanticAnswerCache, CachedPDFLoader)
+
+UBA_PERSIST_DIRECTORY = "./chroma_uba"
+UBA_PDF_PATH = "./data/university_of_bamenda.pdf"
+UBA_URLS = ["https://uniba.cm/"]
+UBA_WIKIPEDIA_QUERIES = [
+    "University of Bamenda About",
+    "University of Bamenda History",
+    "University of Bamenda",
+]
+# Similarity threshold of the question router, written by uba_eval.py --routing --save
+UBA_ROUTER_PATH = os.path.join(UBA_PERSIST_DIRECTORY, "router.json")
+# Answers of uba_rag.py, reused for questions that mean the same thing
+UBA_ANSWER_CACHE_PATH = os.path.join(".cache", "uba_answers.sqlite")
+
+# -------------------------------
+# Sources
+# -------------------------------
+def uba_sources():
+    # PDF: skipped entirely while its mtime/size are unchanged, and a touched but
+    # identical file is read back from the page cache instead of being parsed
+    sources = [file_source(UBA_PDF_PATH, CachedPDFLoader(UBA_PDF_PATH).load)]
+
+    # Web: skipped while the server's ETag/Last-Modified are unchanged
+    for url in UBA_URLS:
+        sources.append(url_source(url, WebBaseLoader([url]).load))
+
+    # Wikipedia has no cheap version check, but unchanged chunks are never re-embedded
+    for query in UBA_WIKIPEDIA_QUERIES:
+        loader = WikipediaLoader(query=query, load_max_docs=1)
+        sources.append(IngestSource(f"wikipedia:{query}", loader.load))
+    return sources
+
+# -------------------------------
+# Build Vector Store
+# -------------------------------
+def build_uba_index(persist_directory=UBA_PERSIST_DIRECTORY, rebuild=False, batch_size=64, max_workers=4):
+    """Bring the persisted Chroma index and its BM25 index in line with the UBA sources"""
+    report = ingest_sources(uba_sources(), persist_directory, rebuild=rebuild,
+                            batch_size=batch_size, max_workers=max_workers)
+    # Same chunk ids as Chroma: only the added/removed chunks touch the lexical index
+    bm25 = update_bm25_index(persist_directory, report, open_vector_store(persist_directory))
+    print(f"🔤 BM25 index: {len(bm25)} chunks, {len(bm25.vocabulary)} terms")
+    # Cached answers built on chunks that changed or disappeared are no longer valid
+    answers = SemanticAnswerCache(UBA_ANSWER_CACHE_PATH)
+    if report.reset:
+        answers.clear()
+    elif report.removed_ids:
+        print(f"🗑️ {answers.invalidate_chunks(report.removed_ids)} cached answers invalidated")
+    return report
+
+# Run once (or whenever the sources change) before starting the Streamlit app:
+#   python Exercises/uba_ingest.py
+def main():
+    arg_parser = argparse.ArgumentParser(description="Build the University of Bamenda vector index")
+    arg_parser.add_argument("--persist-directory", default=UBA_PERSIST_DIRECTORY)
+    arg_parser.add_argument("--rebuild", action="store_true", help="drop the collection and re-embed everything")
+    arg_parser.add_argument("--batch-size", type=int, default=64, help="chunks per embedding request")
+    arg_parser.add_argument("--workers", type=int, default=4, help="embedding requests in flight")
+    args = arg_parser.parse_args()
+    build_uba_index(args.persist_directory, rebuild=args.rebuild,
+                    batch_size=args.batch_size, max_workers=args.workers)
+    print(f"💾 Index written to {args.persist_directory}")
+
+if __name__ == "__main__":
+    main()
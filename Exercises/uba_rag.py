@@ -1,76 +1,117 @@
+import json
 import streamlit as st
-from langchain_community.document_loaders import PyPDFLoader, WebBaseLoader, WikipediaLoader 
-from langchain_text_splitters import CharacterTextSplitter 
-from langchain_community.vectorstores import Chroma 
-from config import load_embeddings, load_google_llm  
+from config import (open_vector_store, load_google_llm, load_embeddings, stream_text, load_bm25_index,
+                    HybridRetriever, DomainRouter, vector_store_centroid, SemanticAnswerCache,
+                    ContextCompressor, load_scorer, index_version)
+from uba_ingest import UBA_PERSIST_DIRECTORY, UBA_ANSWER_CACHE_PATH, UBA_ROUTER_PATH
 
 # -------------------------------
-# Load Data and Build Vector Store
+# Open the Vector Store
 # -------------------------------
-embeddings = load_embeddings()  
-
-# PDF 
-pdf_loader = PyPDFLoader('./data/university_of_bamenda.pdf') 
-pdf_docs = pdf_loader.load()  
-
-# Web 
-urls_data = ["https://uniba.cm/"] 
-web_loader = WebBaseLoader(urls_data) 
-web_docs = web_loader.load()  
-
-# Wikipedia 
-about_loader = WikipediaLoader(query="University of Bamenda About", load_max_docs=1) 
-about_docs = about_loader.load()  
-
-history_loader = WikipediaLoader(query="University of Bamenda History", load_max_docs=1) 
-history_docs = history_loader.load()  
-
-home_loader = WikipediaLoader(query="University of Bamenda", load_max_docs=1) 
-home_docs = home_loader.load()  
-
-all_docs = pdf_docs + web_docs + about_docs + history_docs + home_docs 
-print(f"📚 Loaded {len(all_docs)} total documents.")  
-
-text_splitter = CharacterTextSplitter(     
-    separator="\n\n",     
-    chunk_size=1000,     
-    chunk_overlap=200,     
-    length_function=len,     
-    is_separator_regex=False 
-)  
-
-page_contents = [doc.page_content for doc in all_docs] 
-chunks = text_splitter.create_documents(page_contents)  
-
-print(f"✅ Total number of chunks after combining: {len(chunks)}")  
-
-vector_db = Chroma.from_documents(chunks, embeddings, persist_directory="./chroma_uba") 
-retriever = vector_db.as_retriever(search_kwargs={"k": 3})  
+# The index is built offline by uba_ingest.py; here we only open the persisted
+# collection so Streamlit reruns don't reload or re-embed anything. The cached
+# handles are keyed by index_version, so an ingest run while the app is up
+# (new chunks, or a reset collection) is picked up on the next question.
+def current_version():
+    return index_version(UBA_PERSIST_DIRECTORY)
+
+@st.cache_resource(max_entries=1)
+def _open_vector_db(version):
+    return open_vector_store(UBA_PERSIST_DIRECTORY)
+
+def get_vector_db():
+    return _open_vector_db(current_version())
+
+# Lexical index persisted next to the Chroma files by uba_ingest.py
+@st.cache_resource(max_entries=1)
+def _load_bm25_index(version):
+    return load_bm25_index(UBA_PERSIST_DIRECTORY, _open_vector_db(version))
+
+def get_bm25_index():
+    return _load_bm25_index(current_version())
+
+TOP_K = 3
+# With reranking, this many candidates are fetched and compressed down to CONTEXT_TOKENS
+CANDIDATES = 8
+CONTEXT_TOKENS = 400
+# Rerank with a local cross-encoder (needs sentence-transformers) instead of the lexical scorer
+CROSS_ENCODER = False
+
+# BM25 + vector search in parallel, fused: exact names, titles and fees are not missed
+@st.cache_resource(max_entries=1)
+def _build_retriever(version):
+    return HybridRetriever(_open_vector_db(version), _load_bm25_index(version), k=TOP_K)
+
+def get_retriever():
+    return _build_retriever(current_version())
+
+# Local reranking + overlap stripping + sentence trimming (cross-encoder if installed)
+@st.cache_resource
+def get_compressor():
+    return ContextCompressor(load_scorer(CROSS_ENCODER), top_n=CANDIDATES, token_budget=CONTEXT_TOKENS)
+
+def retrieve(question: str, rerank=True):
+    if not rerank:
+        return get_retriever().get_relevant_documents(question)
+    candidates = get_retriever().get_relevant_documents(question, k=CANDIDATES)
+    return get_compressor().compress(question, candidates)
 
 # -------------------------------
-# Helper Functions
+# Question Routing
 # -------------------------------
-def is_uba_question(question: str) -> bool:     
-    keywords = [         
-        "bamenda", "university of bamenda", "uba", "uniba",         
-        "prof.", "dr.", "campus", "faculty", "department",         
-        "admission", "courses", "tuition", "fees", "library",         
-        "research", "students", "staff", "programs",         
-        "scholarships", "events"     
-    ]     
-    q = question.lower()     
-    return any(keyword in q for keyword in keywords)  
-
-def answer_question(question: str):     
-    if not is_uba_question(question):         
-        return "⚠️ I only answer questions about the University of Bamenda."     
-    docs = retriever.get_relevant_documents(question)      
+# Accepted outright, so only words that name the university itself. Generic words
+# (school, degree, dean, fees...) go through the vocabulary and similarity checks,
+# otherwise "How do I write a Python program?" would be routed here.
+UBA_KEYWORDS = [
+    "bamenda", "university of bamenda", "uba", "uniba", "bambili",
+    "prof.", "dr.",
+]
+
+# Below this share of words known to the indexed chunks a question is rejected without
+# an embedding call; every question of data/uba_routing.json and uba_eval.json with any
+# word in common with the chunks is at 60% or more
+ROUTE_MIN_OVERLAP = 0.55
+ROUTE_THRESHOLD = 0.5
+
+def route_threshold():
+    """Similarity threshold calibrated by `python Exercises/uba_eval.py --routing --save`"""
+    try:
+        with open(UBA_ROUTER_PATH, encoding="utf-8") as f:
+            return json.load(f)["threshold"]
+    except (OSError, ValueError, KeyError):
+        return ROUTE_THRESHOLD
+
+# Keywords first, then a vocabulary check against the indexed chunks (rejects off-topic
+# questions in microseconds), then embedding similarity to the centroid of the stored chunks
+@st.cache_resource(max_entries=1)
+def _build_router(version, threshold):
+    return DomainRouter(
+        UBA_KEYWORDS,
+        vocabulary=_load_bm25_index(version).vocabulary,
+        embeddings=load_embeddings(),
+        centroid=vector_store_centroid(_open_vector_db(version)),
+        threshold=threshold,
+        min_overlap=ROUTE_MIN_OVERLAP,
+    )
+
+def get_router():
+    return _build_router(current_version(), route_threshold())
+
+def is_uba_question(question: str) -> bool:
+    return get_router().route(question).accepted
 
-    if not docs:         
-        return "⚠️ I don’t know from the available documents."      
+# -------------------------------
+# Answer Cache
+# -------------------------------
+# Same question in other words -> same answer, no retrieval and no LLM call.
+# uba_ingest.py invalidates answers whose source chunks changed.
+@st.cache_resource
+def get_answer_cache():
+    return SemanticAnswerCache(UBA_ANSWER_CACHE_PATH, embeddings=load_embeddings(), threshold=0.92, max_entries=1000)
 
+def build_prompt(question: str, docs):
     context = "\n\n".join([f"[Source {i+1}]\n{doc.page_content}" for i, doc in enumerate(docs)])     
-    prompt = f""" You are an AI assistant for the University of Bamenda. 
+    return f""" You are an AI assistant for the University of Bamenda. 
     Use the following context to answer the question. 
     If the answer is not in the context, say "I don’t know from the available documents."  
 
@@ -79,10 +120,39 @@ def answer_question(question: str):
     Question: {question}  
 
     Answer (with sources if possible): """     
+
+def stream_answer(question: str, rerank=True):
+    """Yield the answer piece by piece as the model generates it"""
+    if not is_uba_question(question):
+        yield "⚠️ I only answer questions about the University of Bamenda."
+        return
+
+    cached = get_answer_cache().lookup(question)
+    if cached is not None:
+        yield cached[0]
+        return
+
+    docs = retrieve(question, rerank)
+
+    if not docs:         
+        yield "⚠️ I don’t know from the available documents."
+        return
+
+    prompt = build_prompt(question, docs)
     llm = load_google_llm()     
-    response = llm.invoke(prompt)      
+    parts = []
+    for text in stream_text(llm, prompt):
+        parts.append(text)
+        yield text
 
-    return f"{response}"   
+    answer = "".join(parts)
+    chunk_ids = [doc.metadata.get("chunk_id") for doc in docs]
+    # Only grounded answers whose chunks can be tracked for invalidation are cached
+    if "I don’t know" not in answer and all(chunk_ids):
+        get_answer_cache().store(question, answer, chunk_ids)
+
+def answer_question(question: str, rerank=True):     
+    return "".join(stream_answer(question, rerank))
 
 # -------------------------------
 # Streamlit UI
@@ -92,13 +162,19 @@ def main():
     st.write("Ask me anything about the University of Bamenda!")
 
     question = st.text_input("❓ Your question:")
+    rerank = st.sidebar.checkbox("🎯 Rerank and compress the context", value=True)
 
     if st.button("Get Answer"):
         if question.strip():
-            answer = answer_question(question)
-            st.markdown(f"💡 **Answer:** {answer}")
+            st.markdown("💡 **Answer:**")
+            # Tokens are rendered as they arrive instead of after the full completion
+            st.write_stream(stream_answer(question, rerank))
         else:
             st.warning("Please enter a question.")
 
+    stats = get_answer_cache().stats()
+    st.sidebar.caption(f"♻️ Answer cache: {stats['entries']} answers, "
+                       f"{stats['hit_rate']:.0%} hit rate ({stats['hits']}/{stats['hits'] + stats['misses']})")
+
 if __name__ == "__main__":
     main()
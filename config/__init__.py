@@ -2,11 +2,91 @@
 # Importing from the settings file
 from .setting import(
     environmental_variables,
+    reset_clients,
     load_google_llm,
     load_google_chat_model,
     weatherContext,
     load_embeddings,
-    newsContext
+    newsContext,
+    get_http_client,
+    WeatherAPILoader,
+    NewsAPILoader
+)
+from .http_client import CachedHTTPClient
+from .async_context import(
+    ContextResult,
+    anewsContext,
+    aweatherContext,
+    abatch_news_context,
+    abatch_weather_context,
+    batch_news_context,
+    batch_weather_context
+)
+from .cache import(
+    SQLiteCache,
+    CachedEmbeddings,
+    SemanticAnswerCache
+)
+from .ingest import(
+    build_text_splitter,
+    open_vector_store,
+    IngestSource,
+    file_source,
+    url_source,
+    chunk_id,
+    iter_chunks,
+    upsert_in_batches,
+    ingest_sources
+)
+from .streaming import(
+    chunk_text,
+    stream_text,
+    PartialJSONParser,
+    StreamingPydanticParser,
+    ChatRunner
+)
+from .retrieval import(
+    tokenize,
+    BM25Index,
+    load_bm25_index,
+    update_bm25_index,
+    index_version,
+    reciprocal_rank_fusion,
+    HybridRetriever
+)
+from .routing import(
+    RouteDecision,
+    DomainRouter,
+    vector_store_centroid,
+    calibrate_threshold
+)
+from .rerank import(
+    LexicalScorer,
+    CrossEncoderScorer,
+    load_scorer,
+    split_sentences,
+    split_units,
+    strip_overlap,
+    ContextCompressor
+)
+from .pdf_loader import(
+    file_sha256,
+    load_pdf,
+    CachedPDFLoader
+)
+from .memory import(
+    estimate_tokens,
+    ConversationMemory
 )
 #Export so, any file in our app can use 659443771
-__all__=["environmental_variables", "load_google_llm", "load_google_chat_model","weatherContext","load_embeddings","newsContext"]
\ No newline at end of file
+__all__=["environmental_variables", "reset_clients", "load_google_llm", "load_google_chat_model","weatherContext","load_embeddings","newsContext",
+         "get_http_client","WeatherAPILoader","NewsAPILoader","CachedHTTPClient",
+         "ContextResult","anewsContext","aweatherContext","abatch_news_context","abatch_weather_context","batch_news_context","batch_weather_context",
+         "build_text_splitter","open_vector_store","IngestSource","file_source","url_source","chunk_id","iter_chunks","upsert_in_batches","ingest_sources",
+         "SQLiteCache","CachedEmbeddings","SemanticAnswerCache",
+         "chunk_text","stream_text","PartialJSONParser","StreamingPydanticParser","ChatRunner",
+         "estimate_tokens","ConversationMemory",
+         "tokenize","BM25Index","load_bm25_index","update_bm25_index","index_version","reciprocal_rank_fusion","HybridRetriever",
+         "RouteDecision","DomainRouter","vector_store_centroid","calibrate_threshold",
+         "LexicalScorer","CrossEncoderScorer","load_scorer","split_sentences","split_units","strip_overlap","ContextCompressor",
+         "file_sha256","load_pdf","CachedPDFLoader"]
\ No newline at end of file
@@ -0,0 +1,63 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Optional
+from .setting import newsContext, weatherContext, NEWS_CACHE_TTL, WEATHER_CACHE_TTL
+
+# Async / batch versions of newsContext and weatherContext.
+# The HTTP layer is synchronous (pooled requests.Session), so each fetch runs in a
+# worker thread; a semaphore bounds how many run at once.
+
+
+@dataclass
+class ContextResult:
+    query: str
+    data: Optional[Any] = None
+    error: Optional[Exception] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+async def anewsContext(query, max_age=NEWS_CACHE_TTL, timeout=20):
+    return await asyncio.wait_for(asyncio.to_thread(newsContext, query, max_age), timeout)
+
+
+async def aweatherContext(city, max_age=WEATHER_CACHE_TTL, timeout=20):
+    return await asyncio.wait_for(asyncio.to_thread(weatherContext, city, max_age), timeout)
+
+
+async def _gather(fetch, queries, concurrency, timeout):
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(query):
+        async with semaphore:
+            try:
+                return ContextResult(query, data=await fetch(query, timeout=timeout))
+            except Exception as e:
+                # One bad query (timeout, HTTP error...) must not sink the whole batch
+                if isinstance(e, asyncio.TimeoutError):
+                    e = TimeoutError(f"{query!r} timed out after {timeout}s")
+                return ContextResult(query, error=e)
+
+    # gather keeps the input order
+    return await asyncio.gather(*(one(query) for query in queries))
+
+
+async def abatch_news_context(queries, concurrency=8, timeout=20):
+    """Fetch news for every query concurrently, results in input order"""
+    return await _gather(anewsContext, queries, concurrency, timeout)
+
+
+async def abatch_weather_context(cities, concurrency=8, timeout=20):
+    """Fetch weather for every city concurrently, results in input order"""
+    return await _gather(aweatherContext, cities, concurrency, timeout)
+
+
+# Sync entry points for scripts and Streamlit pages (no running event loop there)
+def batch_news_context(queries, concurrency=8, timeout=20):
+    return asyncio.run(abatch_news_context(queries, concurrency, timeout))
+
+
+def batch_weather_context(cities, concurrency=8, timeout=20):
+    return asyncio.run(abatch_weather_context(cities, concurrency, timeout))
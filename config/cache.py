@@ -0,0 +1,346 @@
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+from array import array
+from langchain_core.embeddings import Embeddings
+
+# Local caches live here (relative to where the app is started)
+CACHE_DIR = ".cache"
+
+
+# -------------------------------
+# Generic SQLite key/value store
+# -------------------------------
+class SQLiteCache:
+    """Small persistent key/value cache with LRU eviction and optional TTL"""
+
+    def __init__(self, path, max_entries=100_000, ttl=None, table="cache"):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.table = table
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # One connection shared by the threads of this process, guarded by _lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {table} "
+            "(key TEXT PRIMARY KEY, value BLOB, created REAL, last_used REAL)"
+        )
+        self._conn.execute(f"CREATE INDEX IF NOT EXISTS {table}_last_used ON {table}(last_used)")
+        self._conn.commit()
+
+    def _expired(self, created, now):
+        return self.ttl is not None and now - created > self.ttl
+
+    def get_many(self, keys):
+        """Return {key: value} for the keys found (and not expired)"""
+        keys = list(dict.fromkeys(keys))
+        found = {}
+        if not keys:
+            return found
+        now = time.time()
+        with self._lock:
+            expired = []
+            # Stay under SQLite's limit on bound parameters
+            for start in range(0, len(keys), 500):
+                part = keys[start:start + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT key, value, created FROM {self.table} WHERE key IN ({marks})", part
+                ).fetchall()
+                for key, value, created in rows:
+                    if self._expired(created, now):
+                        expired.append(key)
+                    else:
+                        found[key] = value
+            if found:
+                self._conn.executemany(
+                    f"UPDATE {self.table} SET last_used=? WHERE key=?",
+                    [(now, key) for key in found]
+                )
+            if expired:
+                self._conn.executemany(f"DELETE FROM {self.table} WHERE key=?", [(k,) for k in expired])
+            self._conn.commit()
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def get(self, key):
+        return self.get_many([key]).get(key)
+
+    def set_many(self, items):
+        items = list(items)
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                f"INSERT OR REPLACE INTO {self.table} (key, value, created, last_used) VALUES (?, ?, ?, ?)",
+                [(key, value, now, now) for key, value in items]
+            )
+            self._evict()
+            self._conn.commit()
+
+    def set(self, key, value):
+        self.set_many([(key, value)])
+
+    def delete(self, key):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table} WHERE key=?", (key,))
+            self._conn.commit()
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute(f"DELETE FROM {self.table}")
+            self._conn.commit()
+
+    def _evict(self):
+        # Drop the least recently used rows once we go over max_entries
+        count = self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+        overflow = count - self.max_entries
+        if overflow > 0:
+            self._conn.execute(
+                f"DELETE FROM {self.table} WHERE key IN "
+                f"(SELECT key FROM {self.table} ORDER BY last_used ASC LIMIT ?)",
+                (overflow,)
+            )
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self),
+        }
+
+
+# -------------------------------
+# Embedding cache
+# -------------------------------
+def normalize_text(text):
+    # Same text with different unicode forms or whitespace embeds to the same key
+    return " ".join(unicodedata.normalize("NFC", text).split())
+
+
+def _pack(vector):
+    return array("f", vector).tobytes()
+
+
+def _unpack(blob):
+    values = array("f")
+    values.frombytes(blob)
+    return values.tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only calls the remote model for texts it has never seen"""
+
+    def __init__(self, underlying, model_name, cache):
+        self.underlying = underlying
+        self.model_name = model_name
+        self.cache = cache
+        self.hits = 0
+        self.misses = 0
+        self.remote_calls = 0
+
+    def _key(self, kind, text):
+        # Documents and queries are embedded with different task types, keep them apart
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        return f"{self.model_name}:{kind}:{digest}"
+
+    def embed_documents(self, texts):
+        keys = [self._key("document", text) for text in texts]
+        found = self.cache.get_many(keys)
+
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key not in found and key not in missing:
+                missing[key] = text
+        self.hits += len(texts) - len(missing)
+        self.misses += len(missing)
+
+        if missing:
+            vectors = self.underlying.embed_documents(list(missing.values()))
+            self.remote_calls += 1
+            new_items = list(zip(missing.keys(), (_pack(v) for v in vectors)))
+            self.cache.set_many(new_items)
+            found.update(new_items)
+        return [_unpack(found[key]) for key in keys]
+
+    def embed_query(self, text):
+        key = self._key("query", text)
+        blob = self.cache.get(key)
+        if blob is not None:
+            self.hits += 1
+            return _unpack(blob)
+        self.misses += 1
+        vector = self.underlying.embed_query(text)
+        self.remote_calls += 1
+        self.cache.set(key, _pack(vector))
+        return vector
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "remote_calls": self.remote_calls,
+            "entries": len(self.cache),
+        }
+
+
+# -------------------------------
+# Semantic answer cache
+# -------------------------------
+def _unit(vector):
+    norm = sum(x * x for x in vector) ** 0.5 or 1.0
+    return [x / norm for x in vector]
+
+
+class SemanticAnswerCache:
+    """Answers reused for questions that mean the same thing.
+
+    A question whose embedding has cosine similarity >= threshold with a
+    stored question gets the stored answer. Every answer keeps the ids of the
+    chunks it was generated from; invalidate_chunks() (called after ingest
+    with the removed chunk ids) drops the answers built on them. Least
+    recently used answers are evicted beyond max_entries.
+    """
+
+    def __init__(self, path, embeddings=None, threshold=0.92, max_entries=1000):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.embeddings = embeddings
+        self.threshold = threshold
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.invalidated = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS answers (id INTEGER PRIMARY KEY, question TEXT, embedding BLOB, "
+            "answer TEXT, created REAL, last_used REAL, hits INTEGER DEFAULT 0)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS answer_chunks (answer_id INTEGER, chunk_id TEXT)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS answer_chunks_chunk ON answer_chunks(chunk_id)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS answers_last_used ON answers(last_used)")
+        self._conn.commit()
+        # id -> unit vector, reloaded when another process (e.g. the ingest script) changed the file
+        self._vectors = {}
+        self._data_version = None
+
+    def _refresh(self):
+        version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._data_version:
+            rows = self._conn.execute("SELECT id, embedding FROM answers").fetchall()
+            self._vectors = {answer_id: _unpack(blob) for answer_id, blob in rows}
+            self._data_version = version
+
+    def lookup(self, question):
+        """Return (answer, similarity) of the closest stored question, or None below the threshold"""
+        query = _unit(self.embeddings.embed_query(question))
+        with self._lock:
+            self._refresh()
+            best_id, best = None, -1.0
+            for answer_id, vector in self._vectors.items():
+                similarity = sum(a * b for a, b in zip(query, vector))
+                if similarity > best:
+                    best_id, best = answer_id, similarity
+            if best_id is None or best < self.threshold:
+                self.misses += 1
+                return None
+            row = self._conn.execute("SELECT answer FROM answers WHERE id=?", (best_id,)).fetchone()
+            if row is None:
+                self._vectors.pop(best_id, None)
+                self.misses += 1
+                return None
+            self._conn.execute("UPDATE answers SET last_used=?, hits=hits+1 WHERE id=?", (time.time(), best_id))
+            self._conn.commit()
+            self.hits += 1
+            return row[0], best
+
+    def store(self, question, answer, chunk_ids):
+        vector = _unit(self.embeddings.embed_query(question))
+        now = time.time()
+        with self._lock:
+            cursor = self._conn.execute(
+                "INSERT INTO answers (question, embedding, answer, created, last_used) VALUES (?, ?, ?, ?, ?)",
+                (question, _pack(vector), answer, now, now)
+            )
+            answer_id = cursor.lastrowid
+            self._conn.executemany("INSERT INTO answer_chunks (answer_id, chunk_id) VALUES (?, ?)",
+                                   [(answer_id, chunk_id) for chunk_id in set(chunk_ids)])
+            self._vectors[answer_id] = vector
+            self._evict()
+            self._conn.commit()
+
+    def _delete(self, answer_ids):
+        marks = ",".join("?" * len(answer_ids))
+        self._conn.execute(f"DELETE FROM answers WHERE id IN ({marks})", answer_ids)
+        self._conn.execute(f"DELETE FROM answer_chunks WHERE answer_id IN ({marks})", answer_ids)
+        for answer_id in answer_ids:
+            self._vectors.pop(answer_id, None)
+
+    def _evict(self):
+        overflow = self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0] - self.max_entries
+        if overflow > 0:
+            rows = self._conn.execute("SELECT id FROM answers ORDER BY last_used ASC LIMIT ?", (overflow,)).fetchall()
+            self._delete([row[0] for row in rows])
+
+    def invalidate_chunks(self, chunk_ids):
+        """Drop every answer generated from any of these chunks, returns how many"""
+        chunk_ids = list(chunk_ids)
+        answer_ids = set()
+        with self._lock:
+            for start in range(0, len(chunk_ids), 500):
+                part = chunk_ids[start:start + 500]
+                marks = ",".join("?" * len(part))
+                rows = self._conn.execute(
+                    f"SELECT DISTINCT answer_id FROM answer_chunks WHERE chunk_id IN ({marks})", part
+                ).fetchall()
+                answer_ids.update(row[0] for row in rows)
+            answer_ids = list(answer_ids)
+            for start in range(0, len(answer_ids), 500):
+                self._delete(answer_ids[start:start + 500])
+            self._conn.commit()
+        self.invalidated += len(answer_ids)
+        return len(answer_ids)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM answers")
+            self._conn.execute("DELETE FROM answer_chunks")
+            self._conn.commit()
+            self._vectors = {}
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM answers").fetchone()[0]
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "invalidated": self.invalidated,
+            "entries": len(self),
+        }
@@ -0,0 +1,113 @@
+import copy
+import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+class _CacheEntry:
+    def __init__(self, data, etag=None, last_modified=None):
+        self.data = data
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetched_at = time.monotonic()
+
+
+class CachedHTTPClient:
+    """Shared HTTP client for the API loaders.
+
+    - one pooled requests.Session (keep-alive, no new TCP/TLS handshake per call)
+    - timeouts on every request
+    - TTL cache of JSON responses, revalidated with ETag / Last-Modified when the API sends them
+    - concurrent identical requests share one in-flight fetch
+    """
+
+    def __init__(self, ttl=300, timeout=(5, 15), pool_size=10, max_entries=512):
+        self.ttl = ttl
+        self.timeout = timeout
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.session = requests.Session()
+        retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504],
+                      allowed_methods=["GET", "HEAD"])
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self._cache = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def get_json(self, url, params=None, ttl=None, cache_key=None):
+        """GET url and return the decoded JSON, served from cache while fresh
+
+        Every caller gets its own copy, so changing the result never changes the cache.
+        """
+        params = params or {}
+        ttl = self.ttl if ttl is None else ttl
+        if cache_key is None:
+            cache_key = (url, tuple(sorted(params.items())))
+
+        with self._lock:
+            entry = self._cache.get(cache_key)
+            if entry is not None and time.monotonic() - entry.fetched_at < ttl:
+                self._cache.move_to_end(cache_key)
+                self.hits += 1
+                return copy.deepcopy(entry.data)
+            self.misses += 1
+            future = self._inflight.get(cache_key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[cache_key] = future
+
+        # Somebody is already fetching this exact query, wait for their result
+        if not leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            data = self._fetch(url, params, cache_key, entry)
+            future.set_result(data)
+            return copy.deepcopy(data)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(cache_key, None)
+
+    def _fetch(self, url, params, cache_key, stale_entry):
+        headers = {}
+        if stale_entry is not None:
+            # Conditional request: the API answers 304 without a body if nothing changed
+            if stale_entry.etag:
+                headers["If-None-Match"] = stale_entry.etag
+            if stale_entry.last_modified:
+                headers["If-Modified-Since"] = stale_entry.last_modified
+
+        response = self.session.get(url, params=params, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and stale_entry is not None:
+            with self._lock:
+                stale_entry.fetched_at = time.monotonic()
+            return stale_entry.data
+
+        data = response.json()
+        # Error payloads (bad city, quota exceeded...) are returned but never cached
+        if response.ok:
+            entry = _CacheEntry(data, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            with self._lock:
+                self._cache[cache_key] = entry
+                self._cache.move_to_end(cache_key)
+                while len(self._cache) > self.max_entries:
+                    self._cache.popitem(last=False)
+        return data
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache)}
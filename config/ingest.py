@@ -0,0 +1,261 @@
+import os
+import json
+import time
+import hashlib
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, field
+from typing import List
+import requests
+from langchain_text_splitters import CharacterTextSplitter
+from langchain_community.vectorstores import Chroma
+from .setting import load_embeddings
+
+# Written next to the Chroma files, records what has already been embedded per source
+MANIFEST_FILE = "ingest_manifest.json"
+
+
+# Same chunking settings used across the RAG exercises
+def build_text_splitter(chunk_size=1000, chunk_overlap=200):
+    return CharacterTextSplitter(
+        separator="\n\n",
+        chunk_size=chunk_size,
+        chunk_overlap=chunk_overlap,
+        length_function=len,
+        is_separator_regex=False
+    )
+
+
+# Serving path: open an already persisted collection, never embeds anything
+def open_vector_store(persist_directory, embeddings=None):
+    if embeddings is None:
+        embeddings = load_embeddings()
+    return Chroma(persist_directory=persist_directory, embedding_function=embeddings)
+
+
+# -------------------------------
+# Sources and fingerprints
+# -------------------------------
+class IngestSource:
+    # key: stable name of the source (file path or URL)
+    # load: callable returning a list of Documents
+    # fingerprint: optional callable returning a version string (mtime, ETag...),
+    #   when it is unchanged since the last run the source is not even loaded
+    def __init__(self, key, load, fingerprint=None):
+        self.key = key
+        self.load = load
+        self.fingerprint = fingerprint
+
+
+def file_fingerprint(path):
+    stat = os.stat(path)
+    return f"{stat.st_mtime_ns}:{stat.st_size}"
+
+
+def url_fingerprint(url):
+    # Use ETag / Last-Modified when the server sends them, otherwise we always reload
+    try:
+        response = requests.head(url, allow_redirects=True, timeout=10)
+    except requests.RequestException:
+        return None
+    return response.headers.get("ETag") or response.headers.get("Last-Modified")
+
+
+def file_source(path, load):
+    return IngestSource(path, load, fingerprint=lambda: file_fingerprint(path))
+
+
+def url_source(url, load):
+    return IngestSource(url, load, fingerprint=lambda: url_fingerprint(url))
+
+
+def chunk_id(source_key, text):
+    # Content hash used as the Chroma document id, identical chunks map to the same id
+    return hashlib.sha256(f"{source_key}\n{text}".encode("utf-8")).hexdigest()
+
+
+# -------------------------------
+# Manifest
+# -------------------------------
+def load_manifest(persist_directory):
+    path = os.path.join(persist_directory, MANIFEST_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(persist_directory, manifest):
+    os.makedirs(persist_directory, exist_ok=True)
+    path = os.path.join(persist_directory, MANIFEST_FILE)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+# -------------------------------
+# Batched, concurrent upserts
+# -------------------------------
+def iter_chunks(docs, splitter):
+    # Split one document at a time so batches can start before the whole source is split
+    for doc in docs:
+        for chunk in splitter.split_documents([doc]):
+            yield chunk
+
+
+def _upsert_batch(vector_db, batch, max_retries, backoff):
+    ids = [cid for cid, _ in batch]
+    texts = [chunk.page_content for _, chunk in batch]
+    metadatas = [chunk.metadata for _, chunk in batch]
+    for attempt in range(max_retries + 1):
+        try:
+            # Chroma upserts by id, so retrying a half-written batch is safe
+            vector_db.add_texts(texts, metadatas=metadatas, ids=ids)
+            return len(batch)
+        except Exception as e:
+            if attempt == max_retries:
+                raise
+            delay = backoff * (2 ** attempt)
+            print(f"⚠️ Batch of {len(batch)} failed ({e}), retrying in {delay:.1f}s...")
+            time.sleep(delay)
+
+
+def upsert_in_batches(vector_db, chunks, batch_size=64, max_workers=4, max_retries=3, backoff=1.0):
+    """Embed and upsert (id, Document) pairs in batches, several batches at a time.
+
+    chunks can be a generator; at most 2 * max_workers batches are held in
+    memory. Returns the number of chunks written.
+    """
+    written = 0
+    pending = set()
+
+    def collect(done):
+        nonlocal written
+        for future in done:
+            written += future.result()
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        batch = []
+        for item in chunks:
+            batch.append(item)
+            if len(batch) < batch_size:
+                continue
+            if len(pending) >= 2 * max_workers:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            pending.add(executor.submit(_upsert_batch, vector_db, batch, max_retries, backoff))
+            batch = []
+        if batch:
+            pending.add(executor.submit(_upsert_batch, vector_db, batch, max_retries, backoff))
+        collect(wait(pending)[0])
+    return written
+
+
+# -------------------------------
+# Incremental ingestion
+# -------------------------------
+@dataclass
+class IngestReport:
+    added_ids: List[str] = field(default_factory=list)
+    removed_ids: List[str] = field(default_factory=list)
+    unchanged_sources: List[str] = field(default_factory=list)
+    added_chunks: list = field(default_factory=list)
+    # True when the collection was emptied first (no manifest or rebuild)
+    reset: bool = False
+
+    def summary(self):
+        return (f"{len(self.added_ids)} chunks embedded, {len(self.removed_ids)} removed, "
+                f"{len(self.unchanged_sources)} sources unchanged")
+
+
+def ingest_sources(sources, persist_directory, embeddings=None, splitter=None,
+                   rebuild=False, prune=True, batch_size=64, max_workers=4, max_retries=3):
+    """Embed only new or changed chunks of sources into persist_directory.
+
+    Chunks are stored under their content hash, vectors of chunks that
+    disappeared from a source are deleted, and an unchanged source is a no-op.
+    """
+    if embeddings is None:
+        embeddings = load_embeddings()
+    if splitter is None:
+        splitter = build_text_splitter()
+
+    vector_db = open_vector_store(persist_directory, embeddings)
+    manifest = None if rebuild else load_manifest(persist_directory)
+    reset = manifest is None
+    # source key -> (fingerprint, chunks) already loaded before the collection was emptied
+    prepared = {}
+    if reset:
+        # No manifest means a fresh store or one built before manifests existed
+        # (random ids, duplicates); start from an empty collection.
+        # Load and split every source first: a missing file or a network error
+        # then fails the run while the old index is still intact.
+        for source in sources:
+            fingerprint = source.fingerprint() if source.fingerprint else None
+            prepared[source.key] = (fingerprint, list(iter_chunks(source.load(), splitter)))
+        vector_db.delete_collection()
+        vector_db = open_vector_store(persist_directory, embeddings)
+        manifest = {}
+
+    report = IngestReport(reset=reset)
+    for source in sources:
+        entry = manifest.get(source.key, {})
+        if source.key in prepared:
+            fingerprint, loaded_chunks = prepared.pop(source.key)
+        else:
+            fingerprint = source.fingerprint() if source.fingerprint else None
+            loaded_chunks = None
+        if fingerprint is not None and entry.get("fingerprint") == fingerprint:
+            report.unchanged_sources.append(source.key)
+            continue
+
+        old_ids = set(entry.get("chunk_ids", []))
+        new_ids = []
+        new_chunks = []
+        seen = set()
+
+        def new_items():
+            chunks = loaded_chunks if loaded_chunks is not None else iter_chunks(source.load(), splitter)
+            for chunk in chunks:
+                cid = chunk_id(source.key, chunk.page_content)
+                if cid in seen:
+                    continue
+                seen.add(cid)
+                if cid in old_ids:
+                    continue
+                chunk.metadata["source_key"] = source.key
+                chunk.metadata["chunk_id"] = cid
+                new_ids.append(cid)
+                new_chunks.append(chunk)
+                yield cid, chunk
+
+        upsert_in_batches(vector_db, new_items(), batch_size=batch_size,
+                          max_workers=max_workers, max_retries=max_retries)
+
+        removed = sorted(old_ids - seen)
+        if removed:
+            vector_db.delete(ids=removed)
+        if not new_chunks and not removed:
+            report.unchanged_sources.append(source.key)
+
+        report.added_ids += new_ids
+        report.added_chunks += new_chunks
+        report.removed_ids += removed
+        manifest[source.key] = {"fingerprint": fingerprint, "chunk_ids": sorted(seen)}
+        # Save after every source so an interrupted run keeps its progress
+        save_manifest(persist_directory, manifest)
+
+    if prune:
+        # Sources no longer listed: drop their vectors too
+        current_keys = {source.key for source in sources}
+        for key in [k for k in manifest if k not in current_keys]:
+            stale = manifest.pop(key).get("chunk_ids", [])
+            if stale:
+                vector_db.delete(ids=stale)
+            report.removed_ids += stale
+        save_manifest(persist_directory, manifest)
+
+    print(f"✅ Ingestion done: {report.summary()}")
+    if hasattr(embeddings, "stats"):
+        print(f"🧠 Embedding cache: {embeddings.stats()}")
+    return report
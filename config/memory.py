@@ -0,0 +1,105 @@
+import re
+from .streaming import chunk_text
+
+# Rough token estimate (~4 characters per token), good enough for budgeting
+CHARS_PER_TOKEN = 4
+
+def estimate_tokens(text):
+    return len(text or "") // CHARS_PER_TOKEN + 1
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s")
+
+SUMMARY_PROMPT = """Update the running summary of a conversation.
+Keep names, facts, decisions and open questions; drop greetings and filler.
+Answer with the new summary only, at most {max_words} words.
+
+Current summary:
+{summary}
+
+New messages:
+{messages}
+"""
+
+
+class ConversationMemory:
+    """Chat history that stays within a token budget.
+
+    - the static prefix (system prompt + context) is built once and sent first,
+      unchanged, every turn (providers can reuse their prompt cache for it)
+    - the latest exchange is kept verbatim, the other recent messages are cut
+      to max_message_tokens so long replies cannot fill the budget on their own
+    - once the prompt goes over max_tokens, the oldest turns are folded into a
+      running summary (by the llm when one is given, otherwise by keeping the
+      first sentence of each folded message) until it is back under half of it,
+      so the summary call happens every few turns, not every turn
+
+    messages() returns (role, text) tuples ready for chat_model.invoke / stream.
+    """
+
+    def __init__(self, system, context=None, llm=None, max_tokens=2000, recent_messages=6, summary_words=150,
+                 max_message_tokens=None):
+        self.prefix = system if context is None else f"{system}\n\nContext:\n{context}"
+        self.prefix_tokens = estimate_tokens(self.prefix)
+        self.llm = llm
+        self.max_tokens = max_tokens
+        self.recent_messages = recent_messages
+        self.summary_words = summary_words
+        self.max_message_tokens = max_message_tokens or max_tokens // 8
+        self.summary = ""
+        self.turns = []
+        self.folds = 0
+
+    def add(self, role, text):
+        self.turns.append((role, chunk_text(text)))
+        self._shorten_older()
+        if self.prompt_tokens() > self.max_tokens:
+            self._fold()
+
+    def add_user(self, text):
+        self.add("user", text)
+
+    def add_ai(self, text):
+        self.add("ai", text)
+
+    def prompt_tokens(self):
+        return (self.prefix_tokens + estimate_tokens(self.summary)
+                + sum(estimate_tokens(text) for _, text in self.turns))
+
+    def _shorten_older(self):
+        # Everything before the latest exchange is cut to max_message_tokens (no model call)
+        limit = self.max_message_tokens * CHARS_PER_TOKEN
+        for i, (role, text) in enumerate(self.turns[:-2]):
+            if len(text) > limit:
+                self.turns[i] = (role, text[:limit].rstrip() + " …")
+
+    def _fold(self):
+        # Fold down to half the budget so the next fold is several turns away;
+        # the latest exchange is never folded
+        target = self.max_tokens // 2
+        folded = []
+        while len(self.turns) > 2 and (len(self.turns) > self.recent_messages or self.prompt_tokens() > target):
+            folded.append(self.turns.pop(0))
+        if folded:
+            self.summary = self._summarize(folded)
+            self.folds += 1
+
+    def _summarize(self, folded):
+        if self.llm is not None:
+            lines = "\n".join(f"{role}: {text}" for role, text in folded)
+            prompt = SUMMARY_PROMPT.format(max_words=self.summary_words, summary=self.summary or "(none)",
+                                           messages=lines)
+            return chunk_text(self.llm.invoke(prompt)).strip()
+        # No model: keep the first sentence of every folded message, newest last
+        sentences = [f"{role}: {_SENTENCE_END.split(text.strip(), maxsplit=1)[0]}" for role, text in folded]
+        words = " ".join([self.summary] + sentences).split()
+        return " ".join(words[-self.summary_words:])
+
+    def messages(self):
+        messages = [("system", self.prefix)]
+        if self.summary:
+            messages.append(("system", f"Summary of the earlier conversation: {self.summary}"))
+        return messages + self.turns
+
+    def clear(self):
+        self.summary = ""
+        self.turns = []
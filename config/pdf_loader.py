@@ -0,0 +1,123 @@
+import os
+import sys
+import json
+import gzip
+import hashlib
+import subprocess
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.documents import Document
+from .cache import CACHE_DIR
+from .pdf_worker import extract_pages
+
+PDF_CACHE_DIR = os.path.join(CACHE_DIR, "pdf")
+# Bump when the extraction changes, older cache files are then ignored
+PDF_CACHE_VERSION = 2
+WORKER_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "pdf_worker.py")
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+# Same document metadata as PyPDFLoader: PDF info keys lowercased, dates in ISO format
+def _pdf_metadata(reader):
+    info = {"producer": "PyPDF", "creator": "PyPDF", "creationdate": ""} | dict(reader.metadata or {})
+    metadata = {}
+    for key, value in info.items():
+        if type(value) not in (str, int):
+            value = str(value)
+        key = key.lstrip("/").lower()
+        if key in ("creationdate", "moddate"):
+            try:
+                value = datetime.strptime(value.replace("'", ""), "D:%Y%m%d%H%M%S%z").isoformat("T")
+            except ValueError:
+                pass
+        elif isinstance(value, str):
+            value = value.strip()
+        metadata[key] = value
+    return metadata
+
+
+def _extract_in_worker(path, start, stop):
+    # A new interpreter per page range: unlike a forked pool this is safe in a process
+    # that already runs threads (Chroma, gRPC clients) and needs no __main__ guard
+    result = subprocess.run([sys.executable, WORKER_PATH, path, str(start), str(stop)],
+                            capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"Extracting pages {start}-{stop - 1} of {path} failed: {result.stderr.strip()}")
+    return json.loads(result.stdout)
+
+
+def _parse_pdf(path, max_workers, pages_per_task):
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    total = len(reader.pages)
+    ranges = [(start, min(start + pages_per_task, total)) for start in range(0, total, pages_per_task)]
+    if len(ranges) <= 1 or max_workers == 1:
+        # Not worth starting processes for a few pages
+        pages = [page for start, stop in ranges for page in extract_pages(path, start, stop)]
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as executor:
+            futures = [executor.submit(_extract_in_worker, path, start, stop) for start, stop in ranges]
+            pages = [page for future in futures for page in future.result()]
+    return _pdf_metadata(reader), pages
+
+
+def _cache_path(cache_dir, sha):
+    return os.path.join(cache_dir, f"{sha}.json.gz")
+
+def _read_cache(path, sha):
+    try:
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get("version") != PDF_CACHE_VERSION or data.get("sha256") != sha:
+        return None
+    return data["metadata"], data["pages"]
+
+def _write_cache(path, sha, metadata, pages):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+        json.dump({"version": PDF_CACHE_VERSION, "sha256": sha, "metadata": metadata, "pages": pages}, f)
+    os.replace(tmp_path, path)
+
+
+def load_pdf(path, max_workers=None, pages_per_task=8, cache_dir=PDF_CACHE_DIR):
+    """One Document per page, same text and metadata as PyPDFLoader.
+
+    Page ranges of pages_per_task pages are extracted in parallel worker
+    processes, and the text and metadata are cached gzip-compressed under
+    cache_dir keyed by the file's sha256, so an unchanged PDF is read back
+    from the cache without parsing.
+    """
+    sha = file_sha256(path)
+    cache_path = _cache_path(cache_dir, sha)
+    cached = _read_cache(cache_path, sha)
+    if cached is None:
+        cached = _parse_pdf(path, max_workers, pages_per_task)
+        _write_cache(cache_path, sha, *cached)
+    metadata, pages = cached
+    # The source is the path asked for, the same file may be cached under another name
+    metadata = metadata | {"source": path, "total_pages": len(pages)}
+    return [Document(page_content=text, metadata=metadata | {"page": number, "page_label": label})
+            for number, label, text in pages]
+
+
+class CachedPDFLoader:
+    """Drop-in for PyPDFLoader(path).load() backed by load_pdf"""
+
+    def __init__(self, path, max_workers=None, pages_per_task=8, cache_dir=PDF_CACHE_DIR):
+        self.path = path
+        self.max_workers = max_workers
+        self.pages_per_task = pages_per_task
+        self.cache_dir = cache_dir
+
+    def load(self):
+        return load_pdf(self.path, self.max_workers, self.pages_per_task, self.cache_dir)
@@ -0,0 +1,18 @@
+import sys
+import json
+
+# Extracts one page range of a PDF. pdf_loader runs this file in a fresh interpreter
+#   python config/pdf_worker.py <path> <start> <stop>   -> JSON list on stdout
+# so it only imports pypdf: starting a worker stays cheap and never re-runs the caller's script.
+
+
+def extract_pages(path, start, stop):
+    """[[page number, page label, text]] for pages start..stop-1, text as PyPDFLoader gives it"""
+    from pypdf import PdfReader
+    reader = PdfReader(path)
+    labels = reader.page_labels
+    return [[number, labels[number], reader.pages[number].extract_text().strip()] for number in range(start, stop)]
+
+
+if __name__ == "__main__":
+    json.dump(extract_pages(sys.argv[1], int(sys.argv[2]), int(sys.argv[3])), sys.stdout)
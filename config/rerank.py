@@ -0,0 +1,195 @@
+import re
+from langchain_core.documents import Document
+from .retrieval import BM25Index
+from .memory import estimate_tokens
+
+
+# -------------------------------
+# Scorers
+# -------------------------------
+class LexicalScorer:
+    """Relevance of texts to a query with BM25 over the texts themselves, no model needed"""
+
+    def score(self, query, texts):
+        index = BM25Index()
+        for i, text in enumerate(texts):
+            index.add(i, text)
+        scores = dict(index.search(query, k=len(texts)))
+        return [scores.get(i, 0.0) for i in range(len(texts))]
+
+
+class CrossEncoderScorer:
+    """Local cross-encoder (sentence-transformers), more accurate than lexical scoring"""
+
+    def __init__(self, model_name="cross-encoder/ms-marco-MiniLM-L-6-v2"):
+        from sentence_transformers import CrossEncoder
+        self.model = CrossEncoder(model_name)
+
+    def score(self, query, texts):
+        return [float(score) for score in self.model.predict([(query, text) for text in texts])]
+
+
+def load_scorer(cross_encoder=False):
+    """The cross-encoder when asked for and installed, the lexical scorer otherwise"""
+    if cross_encoder:
+        try:
+            return CrossEncoderScorer()
+        except ImportError:
+            print("⚠️ sentence-transformers is not installed, using the lexical scorer")
+    return LexicalScorer()
+
+
+# -------------------------------
+# Text helpers
+# -------------------------------
+_SENTENCE_BREAK = re.compile(r"(?<=[.!?])\s+|\s*\n+\s*")
+# A "sentence" ending in one of these was cut at an abbreviation ("Prof. Theresia")
+_ABBREVIATION = re.compile(r"\b(?:prof|dr|mr|mrs|ms|st|no|p\.o|b\.sc|m\.sc|ph\.d|e\.g|i\.e)\.$", re.IGNORECASE)
+
+def split_sentences(text):
+    sentences = []
+    for piece in _SENTENCE_BREAK.split(text or ""):
+        if not piece:
+            continue
+        if sentences and _ABBREVIATION.search(sentences[-1]):
+            sentences[-1] += " " + piece
+        else:
+            sentences.append(piece)
+    return sentences
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+_BULLET = re.compile(r"^(?:[-•*▪]|\d{1,2}[.)])\s+")
+_LINE_END = re.compile(r"[.!?:;]$")
+# Lines shorter than this are headings, table cells or address lines, not wrapped prose
+SHORT_LINE = 60
+
+def _line_kind(line):
+    if _BULLET.match(line):
+        return "list"
+    return "short" if len(line) < SHORT_LINE else "prose"
+
+def split_units(text):
+    """Scoring units of a chunk: sentences of prose, but a list (with the heading just
+    above it) or a run of short lines (table, address block) stays one unit, so list
+    items that share no word with the question are kept with the heading that does"""
+    units = []
+    for paragraph in _PARAGRAPH_BREAK.split(text or ""):
+        groups = []  # [kind, lines]
+        for line in (line.strip() for line in paragraph.splitlines()):
+            if not line:
+                continue
+            kind = _line_kind(line)
+            previous = groups[-1] if groups else None
+            if previous and previous[0] == "prose" and not _LINE_END.search(previous[1][-1]) and kind != "list":
+                # Continuation of a wrapped prose line
+                previous[1].append(line)
+            elif previous and previous[0] == kind:
+                previous[1].append(line)
+            elif kind == "list" and previous and previous[0] == "short":
+                # The last short line before the first item is the list's heading
+                heading = previous[1].pop()
+                if not previous[1]:
+                    groups.pop()
+                groups.append(["list", [heading, line]])
+            else:
+                groups.append([kind, [line]])
+        for kind, lines in groups:
+            if kind == "prose":
+                units.extend(split_sentences(" ".join(lines)))
+            else:
+                units.append("\n".join(lines))
+    return units
+
+def overlap_length(a, b, min_chars=40):
+    """Length of the longest end of a that is also the start of b (chunk overlap), 0 if shorter than min_chars"""
+    probe = b[:min_chars]
+    if len(probe) < min_chars:
+        return 0
+    start = a.find(probe)
+    while start != -1:
+        if b.startswith(a[start:]):
+            return len(a) - start
+        start = a.find(probe, start + 1)
+    return 0
+
+def strip_overlap(texts, min_chars=40):
+    """Remove text repeated between chunks (splitter overlap) and chunks contained in another"""
+    kept = []
+    for text in texts:
+        for other in kept:
+            if text in other:
+                text = ""
+                break
+            text = text[overlap_length(other, text, min_chars):]
+            cut = overlap_length(text, other, min_chars)
+            if cut:
+                text = text[:-cut]
+        kept.append(text.strip())
+    return kept
+
+
+# -------------------------------
+# Rerank + compress
+# -------------------------------
+class ContextCompressor:
+    """Post-retrieval stage: rerank over-fetched candidates, then shrink them for the prompt.
+
+    1. score every candidate against the question, keep the top_n (with a token budget
+       it is usually better to keep them all and let step 3 pick sentences)
+    2. strip the overlap the text splitter put between adjacent chunks
+    3. score units (prose sentences; lists and tables stay whole, see split_units); drop
+       those below min_ratio * best score (their neighbours stay), then fill token_budget best first
+
+    Documents keep their metadata (chunk ids), only page_content is shortened.
+    """
+
+    def __init__(self, scorer=None, top_n=8, token_budget=400, min_ratio=0.2, window=1):
+        self.scorer = scorer or LexicalScorer()
+        self.sentence_scorer = LexicalScorer()
+        self.top_n = top_n
+        self.token_budget = token_budget
+        self.min_ratio = min_ratio
+        self.window = window
+
+    def rerank(self, query, docs):
+        scores = self.scorer.score(query, [doc.page_content for doc in docs])
+        ranked = sorted(zip(scores, range(len(docs))), key=lambda pair: -pair[0])
+        return [docs[i] for _, i in ranked[:self.top_n]]
+
+    def compress(self, query, docs):
+        docs = self.rerank(query, docs)
+        texts = strip_overlap([doc.page_content for doc in docs])
+
+        # (doc index, unit index, text) for every unit of every kept chunk
+        sentences = [(d, s, sentence) for d, text in enumerate(texts) for s, sentence in enumerate(split_units(text))]
+        if not sentences:
+            return []
+        scores = self.sentence_scorer.score(query, [sentence for _, _, sentence in sentences])
+        best = max(scores)
+
+        priority = {}
+        for position, ((d, s, _), score) in enumerate(zip(sentences, scores)):
+            if best > 0 and score < self.min_ratio * best:
+                continue
+            priority[position] = max(priority.get(position, 0.0), score)
+            # Neighbours in the same chunk carry half the priority of the sentence they surround
+            for offset in range(1, self.window + 1):
+                for neighbour in (position - offset, position + offset):
+                    if 0 <= neighbour < len(sentences) and sentences[neighbour][0] == d:
+                        priority[neighbour] = max(priority.get(neighbour, 0.0), score / 2)
+
+        selected, used = set(), 0
+        for position in sorted(priority, key=lambda p: (-priority[p], p)):
+            tokens = estimate_tokens(sentences[position][2])
+            if used + tokens > self.token_budget:
+                continue
+            selected.add(position)
+            used += tokens
+
+        compressed = []
+        for d, doc in enumerate(docs):
+            kept = [sentence for position, (doc_index, _, sentence) in enumerate(sentences)
+                    if doc_index == d and position in selected]
+            if kept:
+                compressed.append(Document(page_content="\n".join(kept), metadata=doc.metadata))
+        return compressed
@@ -0,0 +1,214 @@
+import os
+import re
+import json
+import math
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from langchain_core.documents import Document
+
+BM25_FILE = "bm25_index.json"
+
+# Words that say nothing about the topic of a question
+STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from has have how i if in is it its
+me my of on or please should tell the their there this to was we were what when where which who
+whom whose why will with would you your about give list any all some much many
+""".split())
+
+_THOUSANDS = re.compile(r"(?<=\d)[,.](?=\d{3}\b)")
+_TOKEN = re.compile(r"\w+")
+
+def tokenize(text):
+    """Lowercased word tokens; "50,000 FCFA" -> ["50000", "fcfa"] so amounts match exactly"""
+    return _TOKEN.findall(_THOUSANDS.sub("", (text or "").lower()))
+
+
+# -------------------------------
+# Lexical index
+# -------------------------------
+class BM25Index:
+    """Inverted index with BM25 scoring, updated chunk by chunk.
+
+    Documents are keyed by the same chunk ids as the Chroma collection, so
+    lexical and vector hits can be fused and ingest add/remove lists apply as is.
+    """
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.docs = {}       # chunk id -> {"text", "metadata", "length"}
+        self.postings = {}   # term -> {chunk id: term frequency}
+        self.total_length = 0
+
+    def __len__(self):
+        return len(self.docs)
+
+    def __contains__(self, doc_id):
+        return doc_id in self.docs
+
+    @property
+    def vocabulary(self):
+        return self.postings.keys()
+
+    def add(self, doc_id, text, metadata=None):
+        if doc_id in self.docs:
+            self.remove(doc_id)
+        terms = Counter(tokenize(text))
+        length = sum(terms.values())
+        self.docs[doc_id] = {"text": text, "metadata": metadata or {}, "length": length}
+        self.total_length += length
+        for term, count in terms.items():
+            self.postings.setdefault(term, {})[doc_id] = count
+
+    def remove(self, doc_id):
+        doc = self.docs.pop(doc_id, None)
+        if doc is None:
+            return
+        self.total_length -= doc["length"]
+        for term in set(tokenize(doc["text"])):
+            postings = self.postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self.postings[term]
+
+    def clear(self):
+        self.docs, self.postings, self.total_length = {}, {}, 0
+
+    def search(self, query, k=10):
+        """[(chunk id, score)] best first"""
+        if not self.docs:
+            return []
+        n = len(self.docs)
+        avg_length = self.total_length / n or 1
+        terms = set(tokenize(query))
+        # Question words carry no topic; keep them only if nothing else is left
+        terms = (terms - STOPWORDS) or terms
+        scores = Counter()
+        for term in terms:
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                length = self.docs[doc_id]["length"]
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + self.k1 * (1 - self.b + self.b * length / avg_length))
+        return scores.most_common(k)
+
+    def document(self, doc_id):
+        doc = self.docs[doc_id]
+        return Document(page_content=doc["text"], metadata=doc["metadata"])
+
+    # Only the documents are stored, postings are rebuilt on load
+    def save(self, path):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"k1": self.k1, "b": self.b,
+                       "docs": {doc_id: [doc["text"], doc["metadata"]] for doc_id, doc in self.docs.items()}}, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        index = cls(data.get("k1", 1.5), data.get("b", 0.75))
+        for doc_id, (text, metadata) in data["docs"].items():
+            index.add(doc_id, text, metadata)
+        return index
+
+    @classmethod
+    def from_vector_store(cls, vector_db):
+        """Index every chunk already stored in a Chroma collection"""
+        index = cls()
+        stored = vector_db.get(include=["documents", "metadatas"])
+        for doc_id, text, metadata in zip(stored["ids"], stored["documents"], stored["metadatas"]):
+            index.add(doc_id, text, metadata)
+        return index
+
+
+def bm25_path(persist_directory):
+    return os.path.join(persist_directory, BM25_FILE)
+
+def index_version(persist_directory):
+    """Modification times of the manifest and the BM25 file, changes whenever an ingest run wrote the index"""
+    from .ingest import MANIFEST_FILE
+    paths = [os.path.join(persist_directory, MANIFEST_FILE), bm25_path(persist_directory)]
+    return tuple(os.path.getmtime(path) if os.path.exists(path) else None for path in paths)
+
+def load_bm25_index(persist_directory, vector_db=None):
+    """The persisted lexical index, built from the vector store the first time"""
+    path = bm25_path(persist_directory)
+    if os.path.exists(path):
+        return BM25Index.load(path)
+    if vector_db is None:
+        return BM25Index()
+    index = BM25Index.from_vector_store(vector_db)
+    os.makedirs(persist_directory, exist_ok=True)
+    index.save(path)
+    return index
+
+def update_bm25_index(persist_directory, report, vector_db=None):
+    """Apply one ingest_sources report (added/removed chunk ids) to the persisted index"""
+    path = bm25_path(persist_directory)
+    if report.reset or not os.path.exists(path):
+        # Fresh collection: everything it holds was just added
+        index = BM25Index() if report.reset or vector_db is None else BM25Index.from_vector_store(vector_db)
+    else:
+        index = BM25Index.load(path)
+    for doc_id in report.removed_ids:
+        index.remove(doc_id)
+    for doc_id, chunk in zip(report.added_ids, report.added_chunks):
+        index.add(doc_id, chunk.page_content, chunk.metadata)
+    os.makedirs(persist_directory, exist_ok=True)
+    index.save(path)
+    return index
+
+
+# -------------------------------
+# Hybrid search
+# -------------------------------
+def reciprocal_rank_fusion(rankings, rrf_k=60):
+    """Fuse several best-first id lists: score(id) = sum of 1 / (rrf_k + rank)"""
+    scores = Counter()
+    for ranking in rankings:
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] += 1.0 / (rrf_k + rank)
+    return [doc_id for doc_id, _ in scores.most_common()]
+
+
+class HybridRetriever:
+    """BM25 and vector search run in parallel, fused with reciprocal-rank fusion.
+
+    Exact terms (names, titles, amounts) are found by BM25 even when their
+    embedding is not close to the question; paraphrases are found by the vectors.
+    """
+
+    def __init__(self, vector_db, bm25_index, k=3, fetch_k=10, rrf_k=60):
+        self.vector_db = vector_db
+        self.bm25_index = bm25_index
+        self.k = k
+        self.fetch_k = fetch_k
+        self.rrf_k = rrf_k
+        self._executor = ThreadPoolExecutor(max_workers=2)
+
+    def _vector_search(self, query):
+        docs = self.vector_db.similarity_search(query, k=self.fetch_k)
+        # Stores built before chunk ids existed: fall back to the text as key
+        return [(doc.metadata.get("chunk_id") or doc.page_content, doc) for doc in docs]
+
+    def _lexical_search(self, query):
+        return [(doc_id, self.bm25_index.document(doc_id)) for doc_id, _ in self.bm25_index.search(query, self.fetch_k)]
+
+    def get_relevant_documents(self, query, k=None):
+        vector_future = self._executor.submit(self._vector_search, query)
+        lexical_future = self._executor.submit(self._lexical_search, query)
+        vector_hits, lexical_hits = vector_future.result(), lexical_future.result()
+
+        docs = dict(lexical_hits)
+        docs.update(vector_hits)
+        fused = reciprocal_rank_fusion([[doc_id for doc_id, _ in vector_hits],
+                                        [doc_id for doc_id, _ in lexical_hits]], self.rrf_k)
+        return [docs[doc_id] for doc_id in fused[:k or self.k]]
+
+    def invoke(self, query):
+        return self.get_relevant_documents(query)
@@ -0,0 +1,103 @@
+import re
+import math
+from dataclasses import dataclass
+from .retrieval import tokenize, STOPWORDS
+
+
+@dataclass
+class RouteDecision:
+    accepted: bool
+    score: float
+    reason: str
+
+    def __bool__(self):
+        return self.accepted
+
+
+def _keyword_regex(keyword):
+    # "vice-chancellor" also matches "vice chancellor"; a trailing "." is kept ("dr." is not "dr")
+    parts = re.split(r"[\s-]+", keyword.strip().lower())
+    return r"[\s-]*".join(re.escape(part) for part in parts)
+
+def _normalize(vector):
+    norm = math.sqrt(sum(x * x for x in vector)) or 1.0
+    return [x / norm for x in vector]
+
+def vector_store_centroid(vector_db):
+    """Mean of the embeddings already stored in a Chroma collection (no embedding calls)"""
+    vectors = vector_db.get(include=["embeddings"])["embeddings"]
+    if vectors is None or len(vectors) == 0:
+        return None
+    return _normalize([sum(column) / len(vectors) for column in zip(*vectors)])
+
+
+class DomainRouter:
+    """Decides whether a question belongs to a domain before any retrieval or LLM call.
+
+    1. keyword regex (all keywords compiled into one pattern) -> accept, so keywords
+       must only name the domain; generic words are left to steps 2 and 3
+    2. less than min_overlap of the question's content words in the corpus vocabulary
+       -> reject, sub-millisecond, no embedding call
+    3. cosine similarity of the question embedding to the domain centroid -> accept above threshold
+
+    Without embeddings/centroid step 3 accepts any question that passed step 2.
+    calibrate_threshold picks threshold from in-domain and off-topic questions.
+    """
+
+    def __init__(self, keywords, vocabulary=None, embeddings=None, centroid=None, threshold=0.5, min_overlap=0.0):
+        alternation = "|".join(sorted((_keyword_regex(k) for k in keywords), key=len, reverse=True))
+        # Lookarounds instead of \b, which never matches after a keyword ending in "."
+        self.keyword_pattern = re.compile(rf"(?<!\w)(?:{alternation})(?!\w)", re.IGNORECASE)
+        self.vocabulary = vocabulary
+        self.embeddings = embeddings
+        self.centroid = centroid
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+
+    def route(self, question):
+        match = self.keyword_pattern.search(question or "")
+        if match:
+            return RouteDecision(True, 1.0, f"keyword '{match.group(0)}'")
+
+        terms = [term for term in tokenize(question) if term not in STOPWORDS]
+        if not terms:
+            return RouteDecision(False, 0.0, "no content words")
+        if self.vocabulary is not None:
+            known = [term for term in terms if term in self.vocabulary]
+            if not known:
+                return RouteDecision(False, 0.0, "no word in common with the documents")
+            overlap = len(known) / len(terms)
+            if overlap < self.min_overlap:
+                return RouteDecision(False, overlap, f"only {overlap:.0%} of the words appear in the documents")
+        else:
+            overlap = 1.0
+
+        if self.embeddings is None or self.centroid is None:
+            return RouteDecision(True, overlap, f"{overlap:.0%} of the words appear in the documents")
+
+        similarity = self.similarity(question)
+        if similarity >= self.threshold:
+            return RouteDecision(True, similarity, f"similar to the documents ({similarity:.2f})")
+        return RouteDecision(False, similarity, f"not similar enough to the documents ({similarity:.2f} < {self.threshold})")
+
+    def similarity(self, question):
+        """Cosine similarity of the question to the centroid (one embedding call)"""
+        query = _normalize(self.embeddings.embed_query(question))
+        return sum(a * b for a, b in zip(query, self.centroid))
+
+
+def calibrate_threshold(in_domain_scores, off_topic_scores):
+    """Threshold that best separates two lists of similarity scores.
+
+    Maximizes (in-domain accepted + off-topic rejected) rates, midway between the
+    neighbouring scores. Returns (threshold, accept rate, reject rate).
+    """
+    scores = sorted(set(in_domain_scores) | set(off_topic_scores))
+    candidates = [(a + b) / 2 for a, b in zip(scores, scores[1:])] or scores
+    best = None
+    for threshold in candidates:
+        accepted = sum(score >= threshold for score in in_domain_scores) / max(len(in_domain_scores), 1)
+        rejected = sum(score < threshold for score in off_topic_scores) / max(len(off_topic_scores), 1)
+        if best is None or accepted + rejected > best[1] + best[2]:
+            best = (threshold, accepted, rejected)
+    return best
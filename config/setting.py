@@ -1,89 +1,163 @@
-import requests
 import os
+import threading
 from pprint import pprint
 # from langchain_google_genai.embeddings.
 from langchain_google_genai.embeddings import GoogleGenerativeAIEmbeddings
+from .cache import CACHE_DIR, SQLiteCache, CachedEmbeddings
+from .http_client import CachedHTTPClient
+
+# .env is only read once per process (find_dotenv walks the filesystem)
+_env_loaded = False
+_env_lock = threading.Lock()
+
 def environmental_variables():
-    import os
+    global _env_loaded
+    if _env_loaded:
+        return
     from dotenv import load_dotenv, find_dotenv
-    load_dotenv(find_dotenv())
+    with _env_lock:
+        if _env_loaded:
+            return
+        load_dotenv(find_dotenv())
+        _env_loaded = True
     GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
     GROQ_API_KEY = os.getenv("GROQ_API_KEY")
     OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
     # print("My Api keys loading...")
     # print(GOOGLE_API_KEY, OPENAI_API_KEY, GROQ_API_KEY)
 
+# -------------------------------
+# Client registry
+# -------------------------------
+# Every client is built once per configuration (kind, model, temperature, key...)
+# and then shared by every caller in the process, including all Streamlit sessions.
+_clients = {}
+_clients_lock = threading.Lock()
+
+def _get_client(key, factory):
+    client = _clients.get(key)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(key)
+            if client is None:
+                client = factory()
+                _clients[key] = client
+    return client
+
+def reset_clients():
+    """Forget every cached client and re-read .env on next use (for tests)"""
+    global _env_loaded
+    with _clients_lock:
+        _clients.clear()
+    with _env_lock:
+        _env_loaded = False
+
 # load google llm
-def load_google_llm():
+def load_google_llm(model="gemini-2.5-flash", temperature=0.9):
     from langchain_google_genai import GoogleGenerativeAI
     #loading our keys
     environmental_variables()
-    google_llm=GoogleGenerativeAI(
-        # pass our configurations here
-        model="gemini-2.5-flash",
-        temperature=0.9,
-    )
-    return google_llm
-
-def load_google_chat_model():
+    def build():
+        return GoogleGenerativeAI(
+            # pass our configurations here
+            model=model,
+            temperature=temperature,
+        )
+    return _get_client(("llm", model, temperature, os.getenv("GOOGLE_API_KEY")), build)
+
+def load_google_chat_model(model="gemini-2.5-flash", temperature=0.9):
     from langchain_google_genai import ChatGoogleGenerativeAI
     environmental_variables()
-    google_chat_model=ChatGoogleGenerativeAI(
-        model="gemini-2.5-flash",
-        temperature=0.9,
-    )
-    return google_chat_model
+    def build():
+        return ChatGoogleGenerativeAI(
+            model=model,
+            temperature=temperature,
+        )
+    return _get_client(("chat", model, temperature, os.getenv("GOOGLE_API_KEY")), build)
+
+# -------------------------------
+# HTTP client for the API loaders
+# -------------------------------
+# How long (seconds) a fetched response is served from cache
+WEATHER_CACHE_TTL = 600
+NEWS_CACHE_TTL = 300
+
+def get_http_client():
+    # One pooled, caching client shared by every loader in the process
+    return _get_client(("http",), CachedHTTPClient)
 
 # Configure weather API end point
 class WeatherAPILoader:
+    BASE_URL = "http://api.openweathermap.org/data/2.5/weather"
+
     # Create a Constructor function
-    def __init__(self, city, api_key):
+    # base_url/client can be swapped, e.g. to point at a local stub server
+    def __init__(self, city, api_key, max_age=WEATHER_CACHE_TTL, base_url=None, client=None):
         # initialize properties
         self.city=city
         self.api_key=api_key
+        self.max_age=max_age
+        self.base_url=base_url or self.BASE_URL
+        self.client=client or get_http_client()
         # Create A method that loads the data
     def load(self):
             # we need to pass some information to our url like the city and api_key
-        url=f"http://api.openweathermap.org/data/2.5/weather?q={self.city}&appid={self.api_key}&units=metric"
-        response=requests.get(url).json()
-        return response
+        params={"q": self.city, "appid": self.api_key, "units": "metric"}
+        # Cached per city, the api key is not part of the cache key
+        cache_key=("weather", self.base_url, self.city.strip().lower())
+        return self.client.get_json(self.base_url, params=params, ttl=self.max_age, cache_key=cache_key)
 
 # initialize the class or an instance
-def weatherContext(city):
-    import os
+def weatherContext(city, max_age=WEATHER_CACHE_TTL):
     environmental_variables()
-    weatherData=WeatherAPILoader(city=city, api_key=os.getenv("WEATHER_API_KEY"))
+    weatherData=WeatherAPILoader(city=city, api_key=os.getenv("WEATHER_API_KEY"), max_age=max_age)
 
     response=weatherData.load()
     return response
 
 
-def load_embeddings():
+# cache=True wraps the model in a persistent on-disk cache, so text that was embedded
+# before (re-indexing the same PDF, repeated questions) never hits the API again.
+# Pass cache=False to get the bare Google embeddings.
+def load_embeddings(cache=True, cache_path=os.path.join(CACHE_DIR, "embeddings.sqlite"), max_entries=200_000):
     environmental_variables()
-    embeddings= GoogleGenerativeAIEmbeddings(
-        model= "models/text-embedding-004",
-        google_api_key=os.getenv("GOOGLE_API_KEY")
-    )
-    # print("embeddings", embeddings)
-    # Test with sample text
-    # Embeddings work by converting text to numerical representations(vectors) that cap
-    #that meaning
-
-    sample_text= [
-        "The day is a bright day",
-        "I love music",
-        "I support my country",
-        "Machine learning is fascinating"
-    ]
-    print("Generating embeddings for the sample text...")
-    print("_"*50)
-
-    # Generate embeddings for multiple texts at once
-    # This is more efficient than generating them one by one
-
-    # embedded_docs= embeddings.embed_documents(sample_text)
-    # print(embedded_docs)
-    return embeddings
+    model_name = "models/text-embedding-004"
+    api_key = os.getenv("GOOGLE_API_KEY")
+
+    def build():
+        embeddings= GoogleGenerativeAIEmbeddings(
+            model= model_name,
+            google_api_key=api_key
+        )
+        if cache:
+            embeddings = CachedEmbeddings(
+                embeddings,
+                model_name=model_name,
+                cache=SQLiteCache(cache_path, max_entries=max_entries, table="embeddings")
+            )
+        # print("embeddings", embeddings)
+        # Test with sample text
+        # Embeddings work by converting text to numerical representations(vectors) that cap
+        #that meaning
+
+        # sample_text= [
+        #     "The day is a bright day",
+        #     "I love music",
+        #     "I support my country",
+        #     "Machine learning is fascinating"
+        # ]
+        # print("Generating embeddings for the sample text...")
+        # print("_"*50)
+
+        # Generate embeddings for multiple texts at once
+        # This is more efficient than generating them one by one
+
+        # embedded_docs= embeddings.embed_documents(sample_text)
+        # print(embedded_docs)
+        return embeddings
+
+    key = ("embeddings", model_name, api_key, cache, cache_path if cache else None, max_entries)
+    return _get_client(key, build)
 
 # load_embeddings()
 
@@ -93,26 +167,29 @@ def load_embeddings():
 
 
 class NewsAPILoader:
+    BASE_URL = "https://newsdata.io/api/1/latest"
+
     # Create a Constructor function
-    def __init__(self,query, api_key):
+    def __init__(self,query, api_key, max_age=NEWS_CACHE_TTL, base_url=None, client=None):
         # initialize properties
         # self.city=city
         self.api_key=api_key
         self.query=query
+        self.max_age=max_age
+        self.base_url=base_url or self.BASE_URL
+        self.client=client or get_http_client()
         # Create A method that loads the data
     def load(self):
             # we need to pass some information to our url like the city and api_key
         # url=f"https://newsdata.io/api/1/news?q={}apikey={self.api_key}&country={self.country} &language=en"
-        url=f"https://newsdata.io/api/1/latest?q={self.query}&apikey={self.api_key}"
-        response=requests.get(url).json()
-        return response
+        params={"q": self.query, "apikey": self.api_key}
+        cache_key=("news", self.base_url, self.query.strip().lower())
+        return self.client.get_json(self.base_url, params=params, ttl=self.max_age, cache_key=cache_key)
 
 # initialize the class or an instance
-def newsContext(query):
-    from pprint import pprint
-    import os
+def newsContext(query, max_age=NEWS_CACHE_TTL):
     environmental_variables()
-    weatherData=NewsAPILoader(query=query,api_key=os.getenv("NEWS_API_KEY"))
+    weatherData=NewsAPILoader(query=query,api_key=os.getenv("NEWS_API_KEY"), max_age=max_age)
     # print(os.getenv("NEWS_API_KEY"))
     response=weatherData.load()
     # pprint(response)
@@ -0,0 +1,211 @@
+import json
+from typing import Annotated
+from pydantic import TypeAdapter, ValidationError
+from langchain_core.exceptions import OutputParserException
+from langchain_core.utils.json import parse_partial_json
+
+
+def chunk_text(chunk):
+    """Text of one streamed chunk (LLMs yield str, chat models yield message chunks)"""
+    if isinstance(chunk, str):
+        return chunk
+    return getattr(chunk, "content", "") or ""
+
+
+def stream_text(llm, prompt):
+    """Yield the completion of prompt piece by piece as the model generates it"""
+    for chunk in llm.stream(prompt):
+        text = chunk_text(chunk)
+        if text:
+            yield text
+
+
+class PartialJSONParser:
+    """Incremental parser for a JSON object that arrives in chunks.
+
+    After every feed(), `fields` holds everything parsed so far (the last value
+    may still be growing) and `completed` lists the keys whose value is final:
+    a key is final once the next key has started or the object is closed.
+    Markdown code fences and any text after the object are ignored.
+    """
+
+    def __init__(self):
+        self.text = ""
+        self.fields = {}
+        self.completed = []
+        self.done = False
+
+    def feed(self, chunk):
+        """Add a chunk, returns the keys that became complete with it"""
+        self.text += chunk
+        start = self.text.find("{")
+        if start == -1 or self.done:
+            return []
+
+        body = self.text[start:]
+        try:
+            parsed, _ = json.JSONDecoder().raw_decode(body)
+            self.done = True
+        except ValueError:
+            # Closes open strings/brackets; None while even that is not parseable
+            parsed = parse_partial_json(body)
+        if not isinstance(parsed, dict):
+            return []
+
+        self.fields = parsed
+        names = list(parsed) if self.done else list(parsed)[:-1]
+        new = [name for name in names if name not in self.completed]
+        self.completed.extend(new)
+        return new
+
+
+REPAIR_PROMPT = """You were given this request:
+{prompt}
+
+Your JSON answer had these fields missing or invalid:
+{problems}
+
+Reply with ONLY a JSON object containing exactly these keys, following this schema:
+{schema}
+"""
+
+
+class StreamingPydanticParser:
+    """Parse a pydantic model out of a streamed completion, field by field.
+
+    stream(llm, prompt) yields a partial model (model_construct with only the
+    validated fields set) every time a field completes, and the fully validated
+    model last. Fields that are missing or fail validation are asked for again
+    on their own (up to max_repairs times) instead of regenerating the object.
+
+    An instance holds the state of its latest call: `text` is the raw output, `fields`
+    / `completed` the JSON parsed so far (handy to render a growing value).
+    """
+
+    def __init__(self, pydantic_object, max_repairs=2):
+        self.pydantic_object = pydantic_object
+        self.max_repairs = max_repairs
+        self.model_fields = pydantic_object.model_fields
+        # Field type + constraints, so one value can be validated on its own
+        self._adapters = {name: TypeAdapter(Annotated[info.annotation, info])
+                          for name, info in self.model_fields.items()}
+        self.values = {}
+        self.errors = {}
+        self.text = ""
+        self.repairs = 0
+        self._json = PartialJSONParser()
+
+    @property
+    def fields(self):
+        return self._json.fields
+
+    @property
+    def completed(self):
+        return self._json.completed
+
+    def partial(self):
+        return self.pydantic_object.model_construct(**self.values)
+
+    def _validate(self, name, value):
+        try:
+            self.values[name] = self._adapters[name].validate_python(value)
+            self.errors.pop(name, None)
+            return True
+        except ValidationError as e:
+            self.errors[name] = "; ".join(error["msg"] for error in e.errors())
+            return False
+
+    def _consume(self, llm, prompt, wanted, every_chunk):
+        """Stream one completion, yield a partial model whenever a wanted field validates"""
+        self._json = PartialJSONParser()
+        for text in stream_text(llm, prompt):
+            self.text += text
+            new = [name for name in self._json.feed(text) if name in wanted]
+            if any([self._validate(name, self._json.fields[name]) for name in new]) or every_chunk:
+                yield self.partial()
+        if not self._json.done:
+            # Output stopped before the object closed, the last value may be cut off
+            for name in self._json.fields:
+                if name in wanted and name not in self._json.completed:
+                    self.errors[name] = "incomplete value"
+
+    def _problems(self):
+        problems = dict(self.errors)
+        for name, info in self.model_fields.items():
+            if info.is_required() and name not in self.values and name not in problems:
+                problems[name] = "missing"
+        return problems
+
+    def stream(self, llm, prompt, every_chunk=False):
+        """Yield partial models as fields validate (or after every chunk), the full model last"""
+        self.values, self.errors, self.text, self.repairs = {}, {}, "", 0
+        yield from self._consume(llm, prompt, set(self.model_fields), every_chunk)
+
+        problems = self._problems()
+        while problems and self.repairs < self.max_repairs:
+            self.repairs += 1
+            properties = self.pydantic_object.model_json_schema().get("properties", {})
+            schema = {name: properties.get(name, {}) for name in problems}
+            repair_prompt = REPAIR_PROMPT.format(
+                prompt=prompt,
+                problems="\n".join(f"- {name}: {reason}" for name, reason in problems.items()),
+                schema=json.dumps(schema, indent=2),
+            )
+            self.text += "\n"
+            yield from self._consume(llm, repair_prompt, set(problems), every_chunk)
+            problems = self._problems()
+
+        if problems:
+            raise OutputParserException(f"Fields still missing or invalid after {self.repairs} repairs: {problems}",
+                                        llm_output=self.text)
+        try:
+            yield self.pydantic_object(**self.values)
+        except ValidationError as e:
+            raise OutputParserException(str(e), llm_output=self.text)
+
+    def invoke(self, llm, prompt):
+        """Run the whole stream and return the validated model"""
+        result = None
+        for result in self.stream(llm, prompt):
+            pass
+        return result
+
+
+class ChatRunner:
+    """Runs chat turns with a single streaming generation each.
+
+    The stream is printed to the console as it arrives and written to every sink
+    (anything with a write() method, e.g. an open journal file); the full text
+    is returned. With a ConversationMemory the user input and the reply are
+    recorded and the prompt is built from it.
+    """
+
+    def __init__(self, model, memory=None, sinks=(), echo=True):
+        self.model = model
+        self.memory = memory
+        self.sinks = list(sinks)
+        self.echo = echo
+
+    def turn(self, user_input=None, prompt=None, sinks=()):
+        """Generate one reply to user_input (through the memory) or to a ready-made prompt"""
+        use_memory = prompt is None and self.memory is not None
+        if use_memory:
+            self.memory.add_user(user_input)
+            prompt = self.memory.messages()
+        elif prompt is None:
+            prompt = user_input
+
+        parts = []
+        for text in stream_text(self.model, prompt):
+            if self.echo:
+                print(text, end="", flush=True)
+            for sink in self.sinks + list(sinks):
+                sink.write(text)
+            parts.append(text)
+        if self.echo:
+            print(flush=True)
+
+        reply = "".join(parts)
+        if use_memory:
+            self.memory.add_ai(reply)
+        return reply
@@ -3,6 +3,7 @@ import os
 import datetime
 from dotenv import load_dotenv, find_dotenv
 from langchain_google_genai import GoogleGenerativeAI
+from config import ChatRunner
 
 load_dotenv(find_dotenv())
 GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
@@ -27,15 +28,12 @@ def daily_journal():
 
     print("REFLECTION FROM AI")
     print("_"*50)
-    for part in Llm.stream(prompt):
-        print(part, end="", flush=True)
     with open("journal.txt", "a") as f:
-        f.write("datetime.now()\n")
+        f.write(f"{datetime.datetime.now()}\n")
         f.write(f"Today I felt {event} because {mood}\n")
-        f.write(f"AI Reflection: {part}\n")
-        f.write("_"*50 + "\n")
-        for part in Llm.stream(prompt):
-            f.write(part)
+        f.write("AI Reflection: ")
+        # One generation, shown on screen and written to the journal as it streams
+        ChatRunner(Llm, sinks=[f]).turn(prompt=prompt)
         f.write("\n"+"_"*50 + "\n")
 
 #Call our function
@@ -1,5 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
-from config import load_google_chat_model
+from config import load_google_chat_model, ChatRunner
 chat_model=load_google_chat_model()
 
 chat_prompt = ChatPromptTemplate.from_messages([
@@ -17,7 +17,6 @@ prompt=chat_prompt.format_messages(
     user_input="Please explain Transformers in GenAi to me, as if I was 6 years, but should not be more than 300 words"
 )
 print("Loading Please wait......")
-response=chat_model.invoke(prompt)
-print(f"response is: {response.content}")
-for part in chat_model.stream(prompt):
-    print(part.content, end="", flush=True)
+print("response is: ")
+# Streams once, prints as it arrives and returns the full text
+response=ChatRunner(chat_model).turn(prompt=prompt)
@@ -1,31 +1,51 @@
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from langchain_community.document_loaders import TextLoader
 from langchain_core.prompts import ChatPromptTemplate
-from config import load_google_chat_model
+from config import load_google_chat_model, ChatRunner, file_source, ingest_sources, open_vector_store, CachedPDFLoader
 chat_model=load_google_chat_model()
 
-loader=PyPDFLoader('./data/ai.pdf')
+AI_PERSIST_DIRECTORY="./chroma_ai"
+# Chunks retrieved per question: prompt size grows with K, not with the documents
+K=4
+# A corpus this small (in chunks) is sent whole instead of searched
+FULL_CONTEXT_MAX_CHUNKS=K
+
+loader=CachedPDFLoader('./data/ai.pdf')
 text_loader=TextLoader('./data/ai.txt')
-final_text=text_loader.load()
+# final_text=text_loader.load()
 # print("My loaded text data is: ",final_text)
-load_data=loader.load()
+# load_data=loader.load()
+
+# Chunk and embed both files once; later runs skip files that did not change
+ingest_sources(
+    [file_source('./data/ai.pdf', loader.load), file_source('./data/ai.txt', text_loader.load)],
+    AI_PERSIST_DIRECTORY,
+)
+vector_db=open_vector_store(AI_PERSIST_DIRECTORY)
+
+# Ids only, the chunk texts are read just when the whole corpus is going into the prompt
+full_context_mode=len(vector_db.get(include=[])["ids"]) <= FULL_CONTEXT_MAX_CHUNKS
+full_context="\n\n".join(vector_db.get(include=["documents"])["documents"]) if full_context_mode else None
+
+def build_context(question):
+    if full_context_mode:
+        return full_context
+    docs=vector_db.similarity_search(question, k=K)
+    return "\n\n".join(f"[Source {i+1}]\n{doc.page_content}" for i, doc in enumerate(docs))
 
 chat_prompt = ChatPromptTemplate.from_messages([
     ("system", "You are a personal assistant, you are to help the user answer questions based "
-    "on {final_text} provided to you, anything outside it, politely say you don't know"),
+    "on the context provided to you, anything outside it, politely say you don't know\n\nContext:\n{context}"),
     ("user", "{user_input}")
 ])
-user_input=input("Please enter your question: \n")
-prompt=chat_prompt.format_messages(
-    final_text=final_text,
-    user_input=user_input
-
-)
+runner=ChatRunner(chat_model)
 while True:
-    # user_input=input("User😎: ")
+    user_input=input("Please enter your question: \n")
     if user_input.lower() in ["exit", "quit", "bye"]:
         print("Chat ended. Goodbye!..........")
         break
+    prompt=chat_prompt.format_messages(
+        context=build_context(user_input),
+        user_input=user_input
+    )
     print("Loading Please wait......")
-    response=chat_model.invoke(prompt)
-    for part in chat_model.stream(user_input):
-        print(part.content, end="", flush=True)
\ No newline at end of file
+    response=runner.turn(prompt=prompt)
@@ -0,0 +1,62 @@
+# Offline throughput benchmark for the ingestion pipeline (no API key needed)
+# python terminal/ingest_benchmark.py --chunks 2000 --latency 0.2
+import time
+import argparse
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings, DeterministicFakeEmbedding
+from langchain_community.vectorstores import Chroma
+from config import upsert_in_batches, chunk_id
+
+
+# Fake model that behaves like a remote API: fixed latency per request
+class SlowFakeEmbeddings(Embeddings):
+    def __init__(self, latency=0.2, size=768):
+        self.latency = latency
+        self.fake = DeterministicFakeEmbedding(size=size)
+
+    def embed_documents(self, texts):
+        time.sleep(self.latency)
+        return self.fake.embed_documents(texts)
+
+    def embed_query(self, text):
+        time.sleep(self.latency)
+        return self.fake.embed_query(text)
+
+
+def fake_chunks(count):
+    for i in range(count):
+        text = f"Chunk {i}: the University of Bamenda offers programmes in science and arts. " * 10
+        yield chunk_id("benchmark", text), Document(page_content=text, metadata={"source_key": "benchmark"})
+
+
+def run(chunks, latency, batch_size, max_workers):
+    # In-memory collection, nothing is persisted
+    vector_db = Chroma(
+        collection_name=f"bench_{batch_size}_{max_workers}_{time.time_ns()}",
+        embedding_function=SlowFakeEmbeddings(latency=latency)
+    )
+    start = time.perf_counter()
+    written = upsert_in_batches(vector_db, fake_chunks(chunks), batch_size=batch_size, max_workers=max_workers)
+    elapsed = time.perf_counter() - start
+    vector_db.delete_collection()
+    return written / elapsed
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="Measure ingestion throughput with a fake embedding model")
+    arg_parser.add_argument("--chunks", type=int, default=2000)
+    arg_parser.add_argument("--latency", type=float, default=0.2, help="seconds per embedding request")
+    arg_parser.add_argument("--batch-sizes", type=int, nargs="+", default=[16, 64, 128])
+    arg_parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    args = arg_parser.parse_args()
+
+    print(f"{'batch':>6} {'workers':>8} {'chunks/sec':>12}")
+    print("_"*30)
+    for batch_size in args.batch_sizes:
+        for max_workers in args.workers:
+            rate = run(args.chunks, args.latency, batch_size, max_workers)
+            print(f"{batch_size:>6} {max_workers:>8} {rate:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
-loader=PyPDFLoader('./data/ai.pdf')
+from langchain_community.document_loaders import TextLoader
+from config import CachedPDFLoader
+# loader=PyPDFLoader('./data/ai.pdf')
+# Same pages as PyPDFLoader, parsed in parallel once and then read from .cache/pdf
+loader=CachedPDFLoader('./data/ai.pdf')
 text_loader=TextLoader('./data/ai.txt')
 final_text=text_loader.load()
 print("My loaded text data is: ",final_text)
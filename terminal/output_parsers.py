@@ -1,4 +1,6 @@
-from config import load_google_llm
+from typing import List
+from pydantic import BaseModel
+from config import load_google_llm, StreamingPydanticParser
 #  import the output
 from langchain_core.output_parsers import StrOutputParser,JsonOutputParser
 from langchain_core.prompts import PromptTemplate
@@ -44,12 +46,32 @@ Please you are now acting as a professional football analyst, for a given footba
 the image url should be fetched from pintress like pixels 
 """
 )
+
+# The JSON format above as a model, so the streamed answer can be checked field by field
+class Player(BaseModel):
+    name: str
+    age: int
+    position: str
+    team: str
+    nationality: str
+    appearances: int
+    goals: int
+    assists: int
+    trophies: List[str]
+
+stream_parser=StreamingPydanticParser(Player)
 user_player=input("Please enter your favorite football player\n")
 prompt=prompt_template.format(
     player=user_player
 )
 print("loading pleasewait......")
-response=llm.invoke(prompt)
-formated_output=parser.parse(response)
+# response=llm.invoke(prompt)
+# formated_output=parser.parse(response)
+printed=set()
+for player in stream_parser.stream(llm, prompt):
+    for name in player.model_fields_set - printed:
+        print(f"{name}: {getattr(player, name)}")
+        printed.add(name)
+formated_output=player.model_dump()
 print(f"formated output is: {formated_output}")
 
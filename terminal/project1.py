@@ -1,4 +1,4 @@
-from config import load_google_chat_model
+from config import load_google_chat_model, ConversationMemory, ChatRunner
 
 chat_model=load_google_chat_model()
 print(f"My chat model is: {chat_model}")
@@ -7,9 +7,14 @@ print(f"My chat model is: {chat_model}")
 print("PERSONAL TUTOR ASSISTANT")
 print("_"*70)
 
-messages=[
-    ("system", "You are a helpful assistant and you play the role of a personal tutor. Be nice and polite."),
-]
+# Recent turns verbatim, older ones folded into a summary so the prompt stays the same size
+memory=ConversationMemory(
+    "You are a helpful assistant and you play the role of a personal tutor. Be nice and polite.",
+    llm=chat_model,
+    max_tokens=2000,
+)
+# One streamed generation per turn: printed live, recorded in the memory
+runner=ChatRunner(chat_model, memory=memory)
 
 # chat loop
 while True:
@@ -17,8 +22,4 @@ while True:
     if user_input.lower() in ["exit", "quit", "bye"]:
         print("Chat ended. Goodbye!..........")
         break
-    messages.append(("user", user_input))
-    response=chat_model.invoke(messages)
-    for part in chat_model.stream(user_input):
-        print(part.content, end="", flush=True)
-   
\ No newline at end of file
+    response=runner.turn(user_input)
@@ -1,5 +1,5 @@
 from typing import List
-from config import load_google_llm
+from config import load_google_llm, StreamingPydanticParser
 from langchain_core.output_parsers import PydanticOutputParser
 from pydantic import BaseModel, Field
 from langchain_core.prompts import PromptTemplate
@@ -20,6 +20,8 @@ class Recipe(BaseModel):
 
     # DONE WITH OUR TYPES
 parser = PydanticOutputParser(pydantic_object=Recipe)
+# Same model, but parsed while the answer streams in; bad fields are re-asked on their own
+stream_parser = StreamingPydanticParser(Recipe)
 
 prompt_template=PromptTemplate.from_template(
     """Based on the food provided {food}, provide a recipe, together with other information in the following JSON format :
@@ -37,12 +39,19 @@ prompt=prompt_template.format(
     food=user_food
 )
 
-response=llm.invoke(prompt)
-print(f"response is: {response}")
+# response=llm.invoke(prompt)
+# print(f"response is: {response}")
 try:
-    parsed_result=parser.parse(response)
+    # Print every field as soon as it is complete and valid
+    printed=set()
+    for parsed_result in stream_parser.stream(llm, prompt):
+        for name in parsed_result.model_fields_set - printed:
+            print(f"{name}: {getattr(parsed_result, name)}")
+            printed.add(name)
     print("THE PARSED RESULT IS: ",parsed_result)
     print(f"THE PARSED RESULT Name is:  ",parsed_result.name)
+    if stream_parser.repairs:
+        print(f"({stream_parser.repairs} repair request(s) for missing/invalid fields)")
 except Exception as e:
-    print("Parsing failed! Raw response:", response)
-    print("Error details:", e)
\ No newline at end of file
+    print("Parsing failed! Raw response:", stream_parser.text)
+    print("Error details:", e)
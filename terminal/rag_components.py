@@ -1,14 +1,14 @@
-from langchain_community.document_loaders import PyPDFLoader, TextLoader
+from langchain_community.document_loaders import TextLoader
 from pprint import pprint
 from langchain_text_splitters import CharacterTextSplitter
-from config import load_google_llm, load_google_chat_model, load_embeddings
-from langchain_community.vectorstores import Chroma, FAISS
+from config import load_google_llm, load_google_chat_model, load_embeddings, file_source, ingest_sources, open_vector_store, CachedPDFLoader
+from langchain_community.vectorstores import FAISS
 
 embeddings=load_embeddings()
-loader=PyPDFLoader('./data/cameroon_history.pdf')
+pdf_path='./data/cameroon_history.pdf'
+loader=CachedPDFLoader(pdf_path)
 # text_loader=TextLoader('./data/ai.txt')
 # final_text=text_loader.load()
-load_data=loader.load()
 # print("My loaded data is: ",load_data)
 
 # print(f"My first document is: {load_data}")
@@ -25,17 +25,18 @@ text_splitter=CharacterTextSplitter(
 # # SPLIT TEXT
 # When You Want to use the create_documents method instead of split_documents
 # Python Comprehension Syntax
-page_contents =[doc.page_content for doc in load_data]
-text1=text_splitter.create_documents(page_contents)
+# page_contents =[doc.page_content for doc in load_data]
+# text1=text_splitter.create_documents(page_contents)
 
-# to get metadata, use split_documents instead
-text = text_splitter.split_documents(load_data)
+# to get metadata, use split_documents instead (ingest_sources does this for us)
+# text = text_splitter.split_documents(load_data)
 
 # print(text[0],"\n\n",text1[0])
 # EMBEDDINGS AND VECTOR STORE
-
-vector_db=Chroma.from_documents(text,embeddings, persist_directory="./chroma_db")
+# Only new or changed chunks are embedded; the PDF is not even parsed when unchanged
+ingest_sources([file_source(pdf_path, loader.load)], "./chroma_db", embeddings=embeddings, splitter=text_splitter)
+vector_db=open_vector_store("./chroma_db", embeddings)
 
 prompt="Who was the first president of Cameroon"
 response=vector_db.similarity_search(prompt)
-print(f"My response is:  {response}")
\ No newline at end of file
+print(f"My response is:  {response}")
@@ -4,7 +4,7 @@
 # propt template is inputing variables in your prompt
 from langchain_core.prompts import PromptTemplate
 
-from config import load_google_llm
+from config import load_google_llm, ChatRunner
 llm=load_google_llm()
 
 prompt_template=PromptTemplate.from_template(
@@ -26,7 +26,5 @@ prompt=prompt_template.format(
 )
 # print output to the user
 print("loading......")
-response=llm.invoke(prompt)
-print(f"response is: {response}")
-for part in llm.stream(prompt):
-    print(part, end="", flush=True)
\ No newline at end of file
+print("response is: ")
+response=ChatRunner(llm).turn(prompt=prompt)
\ No newline at end of file
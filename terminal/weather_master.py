@@ -1,24 +1,34 @@
-from config import load_google_llm, weatherContext
-from langchain_core.prompts import ChatPromptTemplate
+from config import load_google_llm, weatherContext, ConversationMemory
 llm=load_google_llm()
 
 city=input("Where are you currently")
 my_tool=weatherContext(city)
 
-messages=[
-    ("system", "You are a weather master that answer user questions based on: {context}, i want you to advice users on what to wear, what to do and how to prepare the day"
-    "Be flexible and always answer user queries and it should never go off topic")
-]
-chat_template=ChatPromptTemplate.from_messages(messages)
+# Only the parts of the OpenWeatherMap response the advice needs, formatted once
+def compact_weather(data):
+    if not isinstance(data, dict) or "main" not in data:
+        return str(data)
+    return (
+        f"{data.get('name', city)}: {', '.join(w['description'] for w in data.get('weather', []))}; "
+        f"temperature {data['main'].get('temp')}°C, feels like {data['main'].get('feels_like')}°C, "
+        f"humidity {data['main'].get('humidity')}%; wind {data.get('wind', {}).get('speed')} m/s; "
+        f"clouds {data.get('clouds', {}).get('all')}%; visibility {data.get('visibility')} m"
+    )
+
+# The system prompt + weather are a fixed prefix; the chat history is kept within a token budget
+memory=ConversationMemory(
+    "You are a weather master that answer user questions based on the context, i want you to advice users on what to wear, what to do and how to prepare the day"
+    "Be flexible and always answer user queries and it should never go off topic",
+    context=compact_weather(my_tool),
+    llm=llm,
+    max_tokens=1500,
+)
 while True:
     user_input=input("USER: ")
     if user_input.lower() in ["quite","exit"]:
         print("Exiting")
         break
-    messages.append(("human",user_input))
-    prompt=chat_template.format_messages(
-        context=my_tool
-    )
-    response=llm.invoke(prompt)
-    # messages.append("ai", response)
-    print(response)
\ No newline at end of file
+    memory.add_user(user_input)
+    response=llm.invoke(memory.messages())
+    memory.add_ai(response)
+    print(response)